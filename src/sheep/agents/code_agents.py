@@ -1,8 +1,12 @@
 """Code-related agents for implementation workflows."""
 
+from collections.abc import Callable
+from typing import Any
+
 from crewai import Agent, LLM
 
 from sheep.config.llm import create_llm, get_fast_llm, get_reasoning_llm
+from sheep.config.settings import get_settings
 from sheep.tools import (
     DirectoryTreeTool,
     FileReadTool,
@@ -11,12 +15,35 @@ from sheep.tools import (
     GitDiffTool,
     GitLogTool,
     GitStatusTool,
+    get_tool,
+)
+
+# Tool sets are built once per process and shared by every agent instance
+_RESEARCHER_TOOLS = (
+    get_tool(DirectoryTreeTool),
+    get_tool(FileReadTool),
+    get_tool(FileSearchTool),
+    get_tool(GitLogTool),
+)
+_IMPLEMENTER_TOOLS = (
+    get_tool(FileReadTool),
+    get_tool(FileWriteTool),
+    get_tool(FileSearchTool),
+    get_tool(GitStatusTool),
+    get_tool(GitDiffTool),
+)
+_REVIEWER_TOOLS = (
+    get_tool(FileReadTool),
+    get_tool(FileSearchTool),
+    get_tool(GitDiffTool),
+    get_tool(GitStatusTool),
 )
 
 
 def create_code_researcher_agent(
     llm: LLM | None = None,
     verbose: bool = False,
+    step_callback: Callable[[Any], None] | None = None,
 ) -> Agent:
     """
     Create an agent specialized in researching codebases.
@@ -30,6 +57,7 @@ def create_code_researcher_agent(
     Args:
         llm: Optional LLM instance. Uses fast model by default.
         verbose: Enable verbose output.
+        step_callback: Optional callback invoked after each agent step.
 
     Returns:
         Configured Agent instance.
@@ -52,21 +80,18 @@ def create_code_researcher_agent(
             "your findings clearly, including file paths and line numbers."
         ),
         llm=llm,
-        tools=[
-            DirectoryTreeTool(),
-            FileReadTool(),
-            FileSearchTool(),
-            GitLogTool(),
-        ],
+        tools=list(_RESEARCHER_TOOLS),
         verbose=verbose,
+        step_callback=step_callback,
         allow_delegation=False,
-        max_iter=15,
+        max_iter=get_settings().max_iter_researcher,
     )
 
 
 def create_code_implementer_agent(
     llm: LLM | None = None,
     verbose: bool = False,
+    step_callback: Callable[[Any], None] | None = None,
 ) -> Agent:
     """
     Create an agent specialized in implementing code changes.
@@ -80,6 +105,7 @@ def create_code_implementer_agent(
     Args:
         llm: Optional LLM instance. Uses reasoning model by default.
         verbose: Enable verbose output.
+        step_callback: Optional callback invoked after each agent step.
 
     Returns:
         Configured Agent instance.
@@ -102,22 +128,18 @@ def create_code_implementer_agent(
             "changes, you preserve the existing style and conventions of the codebase."
         ),
         llm=llm,
-        tools=[
-            FileReadTool(),
-            FileWriteTool(),
-            FileSearchTool(),
-            GitStatusTool(),
-            GitDiffTool(),
-        ],
+        tools=list(_IMPLEMENTER_TOOLS),
         verbose=verbose,
+        step_callback=step_callback,
         allow_delegation=False,
-        max_iter=20,
+        max_iter=get_settings().max_iter_implementer,
     )
 
 
 def create_code_reviewer_agent(
     llm: LLM | None = None,
     verbose: bool = False,
+    step_callback: Callable[[Any], None] | None = None,
 ) -> Agent:
     """
     Create an agent specialized in reviewing code changes.
@@ -131,6 +153,7 @@ def create_code_reviewer_agent(
     Args:
         llm: Optional LLM instance. Uses reasoning model by default.
         verbose: Enable verbose output.
+        step_callback: Optional callback invoked after each agent step.
 
     Returns:
         Configured Agent instance.
@@ -153,13 +176,9 @@ def create_code_reviewer_agent(
             "for improvement."
         ),
         llm=llm,
-        tools=[
-            FileReadTool(),
-            FileSearchTool(),
-            GitDiffTool(),
-            GitStatusTool(),
-        ],
+        tools=list(_REVIEWER_TOOLS),
         verbose=verbose,
+        step_callback=step_callback,
         allow_delegation=False,
-        max_iter=10,
+        max_iter=get_settings().max_iter_reviewer,
     )
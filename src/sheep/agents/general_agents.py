@@ -1,8 +1,12 @@
 """General-purpose agents for Q&A and chat workflows."""
 
+from collections.abc import Callable
+from typing import Any
+
 from crewai import Agent, LLM
 
 from sheep.config.llm import create_llm, get_reasoning_llm
+from sheep.config.settings import get_settings
 from sheep.tools import (
     DirectoryTreeTool,
     FileReadTool,
@@ -13,12 +17,31 @@ from sheep.tools import (
     ShellCommandTool,
     WebFetchTool,
     WebSearchTool,
+    get_tool,
+)
+
+# Tool set is built once per process and shared by every agent instance
+_CHAT_TOOLS = (
+    # Code exploration tools
+    get_tool(DirectoryTreeTool),
+    get_tool(FileReadTool),
+    get_tool(FileSearchTool),
+    # Git tools for understanding history
+    get_tool(GitLogTool),
+    get_tool(GitStatusTool),
+    get_tool(GitDiffTool),
+    # Web tools for research
+    get_tool(WebSearchTool),
+    get_tool(WebFetchTool),
+    # Shell for running commands
+    get_tool(ShellCommandTool),
 )
 
 
 def create_chat_agent(
     llm: LLM | None = None,
     verbose: bool = False,
+    step_callback: Callable[[Any], None] | None = None,
 ) -> Agent:
     """
     Create an agent specialized in answering general questions.
@@ -33,6 +56,7 @@ def create_chat_agent(
     Args:
         llm: Optional LLM instance. Uses reasoning model by default.
         verbose: Enable verbose output.
+        step_callback: Optional callback invoked after each agent step.
 
     Returns:
         Configured Agent instance.
@@ -64,22 +88,9 @@ def create_chat_agent(
             "accurate answers based on well-known documentation sources."
         ),
         llm=llm,
-        tools=[
-            # Code exploration tools
-            DirectoryTreeTool(),
-            FileReadTool(),
-            FileSearchTool(),
-            # Git tools for understanding history
-            GitLogTool(),
-            GitStatusTool(),
-            GitDiffTool(),
-            # Web tools for research
-            WebSearchTool(),
-            WebFetchTool(),
-            # Shell for running commands
-            ShellCommandTool(),
-        ],
+        tools=list(_CHAT_TOOLS),
         verbose=verbose,
+        step_callback=step_callback,
         allow_delegation=False,
-        max_iter=25,
+        max_iter=get_settings().max_iter_chat,
     )
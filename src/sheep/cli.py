@@ -1,16 +1,16 @@
 """Sheep CLI - Command line interface for the agentic platform."""
 
+from functools import lru_cache
+from importlib import resources
 from pathlib import Path
-from typing import Optional
+from typing import Final, Optional
 
 import typer
-from rich.console import Console
+from rich.console import Console, Group
 from rich.panel import Panel
 from rich.table import Table
 
 from sheep import __version__
-from sheep.config.settings import get_settings
-from sheep.observability import init_observability, setup_logging
 
 app = typer.Typer(
     name="sheep",
@@ -18,16 +18,59 @@ app = typer.Typer(
     add_completion=False,
 )
 
-console = Console()
+# Fallback written by `sheep init` if the packaged template is unavailable
+_ENV_TEMPLATE: Final[str] = """# Sheep Configuration
+# Add your API keys here
+
+OPENAI_API_KEY=
+ANTHROPIC_API_KEY=
+GOOGLE_API_KEY=
+
+SHEEP_DEFAULT_MODEL=openai/gpt-4o
+"""
+
+
+def _read_env_template() -> str | None:
+    """Return the .env template shipped in the wheel, or a source checkout's copy."""
+    packaged = resources.files("sheep").joinpath("templates/env.example")
+    if packaged.is_file():
+        return packaged.read_text()
+    # Source checkouts and editable installs: the wheel-only copy doesn't exist
+    checkout = Path(__file__).resolve().parents[2] / ".env.example"
+    if checkout.is_file():
+        return checkout.read_text()
+    return None
+
+
+@lru_cache(maxsize=1)
+def _console() -> Console:
+    """Get the shared console, created on first use."""
+    return Console()
 
 
 def version_callback(value: bool) -> None:
     """Print version and exit."""
     if value:
-        console.print(f"[bold]Sheep[/bold] version {__version__}")
+        _console().print(f"[bold]Sheep[/bold] version {__version__}")
         raise typer.Exit()
 
 
+def _require_providers(*models: str) -> None:
+    """Exit early if a model's provider has no API key configured."""
+    from sheep.config.settings import PROVIDERS, get_settings, provider_for_model
+
+    available = get_settings().llm.available_providers
+    for model in models:
+        provider = provider_for_model(model)
+        if provider in PROVIDERS and provider not in available:
+            _console().print(
+                f"[bold red]✗ No API key configured for provider '{provider}' "
+                f"(needed by model '{model}').[/bold red]\n"
+                "Add the key to your .env or choose another model, then check with: sheep config"
+            )
+            raise typer.Exit(2)
+
+
 @app.callback()
 def main(
     version: Optional[bool] = typer.Option(
@@ -40,8 +83,15 @@ def main(
     ),
 ) -> None:
     """Sheep - An agentic platform for automated code implementation."""
+    from sheep.config.settings import get_settings
+    from sheep.observability import init_observability_in_background, setup_logging
+
     setup_logging()
-    init_observability()
+
+    # Skip the Langfuse SDK import entirely when observability is not configured;
+    # otherwise let the Langfuse handshake overlap with the command's own imports
+    if get_settings().langfuse.is_configured:
+        init_observability_in_background()
 
 
 @app.command()
@@ -76,6 +126,12 @@ def implement(
         "--no-push",
         help="Don't push changes after commit",
     ),
+    stream: bool = typer.Option(
+        False,
+        "--stream",
+        "-s",
+        help="Print agent steps as they happen",
+    ),
     verbose: bool = typer.Option(
         False,
         "--verbose",
@@ -97,12 +153,19 @@ def implement(
         sheep implement /path/to/repo -i "Add user authentication"
         sheep implement . -i "Fix login bug" -b "fix/login-bug" --no-push
     """
+    from sheep.config.settings import get_settings
+
+    settings = get_settings()
+    _require_providers(settings.fast_model, settings.reasoning_model)
+
     from sheep.flows import run_code_implementation
 
-    console.print(
+    repo_path = repo_path.resolve()
+
+    _console().print(
         Panel(
             f"[bold]Issue:[/bold] {issue}\n"
-            f"[bold]Repository:[/bold] {repo_path.resolve()}\n"
+            f"[bold]Repository:[/bold] {repo_path}\n"
             f"[bold]Branch:[/bold] {branch or '(auto-generated)'}\n"
             f"[bold]Worktree:[/bold] {worktree}\n"
             f"[bold]Auto-push:[/bold] {not no_push}",
@@ -112,17 +175,18 @@ def implement(
     )
 
     result = run_code_implementation(
-        repo_path=str(repo_path.resolve()),
+        repo_path=str(repo_path),
         issue_description=issue,
         branch_name=branch,
         use_worktree=worktree,
         auto_push=not no_push,
         verbose=verbose,
+        stream=stream,
     )
 
     # Display results
     if result.final_status == "completed":
-        console.print("\n[bold green]✓ Implementation completed successfully![/bold green]\n")
+        _console().print("\n[bold green]✓ Implementation completed successfully![/bold green]\n")
 
         table = Table(title="Summary")
         table.add_column("Property", style="cyan")
@@ -133,14 +197,14 @@ def implement(
         table.add_row("Pushed", "Yes" if result.pushed else "No")
         table.add_row("Review Iterations", str(result.review_iterations))
 
-        console.print(table)
+        _console().print(table)
 
         if result.changes_made:
-            console.print("\n[bold]Changes Made:[/bold]")
-            console.print(result.changes_made[:1000])
+            _console().print("\n[bold]Changes Made:[/bold]")
+            _console().print(result.changes_made[:1000])
 
     else:
-        console.print(f"\n[bold red]✗ Implementation failed: {result.error}[/bold red]")
+        _console().print(f"\n[bold red]✗ Implementation failed: {result.error}[/bold red]")
         raise typer.Exit(1)
 
 
@@ -176,12 +240,19 @@ def chat(
         sheep chat "How do I implement OAuth2 in FastAPI?"
         sheep chat "What are best practices for async Python?" -c /path/to/project
     """
+    from sheep.config.settings import get_settings
+
+    _require_providers(get_settings().reasoning_model)
+
     from sheep.flows import run_chat
 
-    console.print(
+    if context:
+        context = context.resolve()
+
+    _console().print(
         Panel(
             f"[bold]Question:[/bold] {question}\n"
-            f"[bold]Context:[/bold] {context.resolve() if context else 'None'}",
+            f"[bold]Context:[/bold] {context or 'None'}",
             title="🐑 Sheep - Chat",
             expand=False,
         )
@@ -189,40 +260,38 @@ def chat(
 
     result = run_chat(
         question=question,
-        context_path=str(context.resolve()) if context else None,
+        context_path=str(context) if context else None,
         verbose=verbose,
     )
 
     # Display answer
     if result.final_status == "completed":
-        console.print("\n[bold]Answer:[/bold]\n")
-        console.print(result.answer)
+        _console().print("\n[bold]Answer:[/bold]\n")
+        _console().print(result.answer)
     else:
-        console.print(f"\n[bold red]✗ Failed to answer: {result.error}[/bold red]")
+        _console().print(f"\n[bold red]✗ Failed to answer: {result.error}[/bold red]")
         raise typer.Exit(1)
 
 
 @app.command()
 def config() -> None:
     """Show current configuration and available LLM providers."""
-    settings = get_settings()
+    from sheep.config.settings import PROVIDERS, get_settings
 
-    console.print(Panel("[bold]Sheep Configuration[/bold]", expand=False))
+    settings = get_settings()
 
     # LLM Providers
     providers_table = Table(title="LLM Providers")
     providers_table.add_column("Provider", style="cyan")
     providers_table.add_column("Status", style="green")
 
-    providers = settings.llm.get_available_providers()
+    providers = settings.llm.available_providers
 
-    for provider in ["openai", "anthropic", "google", "cursor"]:
+    for provider in PROVIDERS:
         status = "✓ Configured" if provider in providers else "✗ Not configured"
         style = "green" if provider in providers else "red"
         providers_table.add_row(provider.capitalize(), f"[{style}]{status}[/{style}]")
 
-    console.print(providers_table)
-
     # Model Configuration
     models_table = Table(title="Model Configuration")
     models_table.add_column("Type", style="cyan")
@@ -232,8 +301,6 @@ def config() -> None:
     models_table.add_row("Fast", settings.fast_model)
     models_table.add_row("Reasoning", settings.reasoning_model)
 
-    console.print(models_table)
-
     # Observability
     obs_table = Table(title="Observability")
     obs_table.add_column("Setting", style="cyan")
@@ -244,7 +311,15 @@ def config() -> None:
     obs_table.add_row("Log Level", settings.log_level)
     obs_table.add_row("Verbose", str(settings.verbose))
 
-    console.print(obs_table)
+    # Render everything in a single pass
+    _console().print(
+        Group(
+            Panel("[bold]Sheep Configuration[/bold]", expand=False),
+            providers_table,
+            models_table,
+            obs_table,
+        )
+    )
 
 
 @app.command()
@@ -255,39 +330,25 @@ def init(
     ),
 ) -> None:
     """Initialize Sheep configuration in a directory."""
-    import shutil
-
     path = path.resolve()
-
-    # Copy .env.example to .env if it doesn't exist
-    env_example = Path(__file__).parent.parent.parent.parent / ".env.example"
     env_target = path / ".env"
 
+    # Write the packaged .env template if a .env doesn't exist yet
     if env_target.exists():
-        console.print("[yellow]⚠ .env file already exists, skipping...[/yellow]")
+        _console().print("[yellow]⚠ .env file already exists, skipping...[/yellow]")
     else:
-        if env_example.exists():
-            shutil.copy(env_example, env_target)
-            console.print(f"[green]✓ Created .env file at {env_target}[/green]")
+        template = _read_env_template()
+        if template is None:
+            env_target.write_text(_ENV_TEMPLATE)
+            _console().print(f"[green]✓ Created minimal .env file at {env_target}[/green]")
         else:
-            # Create a minimal .env
-            env_target.write_text(
-                """# Sheep Configuration
-# Add your API keys here
-
-OPENAI_API_KEY=
-ANTHROPIC_API_KEY=
-GOOGLE_API_KEY=
-
-SHEEP_DEFAULT_MODEL=openai/gpt-4o
-"""
-            )
-            console.print(f"[green]✓ Created minimal .env file at {env_target}[/green]")
+            env_target.write_text(template)
+            _console().print(f"[green]✓ Created .env file at {env_target}[/green]")
 
-    console.print("\n[bold]Next steps:[/bold]")
-    console.print("1. Edit .env and add your API keys")
-    console.print("2. Run: sheep config")
-    console.print("3. Run: sheep implement <repo-path> -i '<issue>'")
+    _console().print("\n[bold]Next steps:[/bold]")
+    _console().print("1. Edit .env and add your API keys")
+    _console().print("2. Run: sheep config")
+    _console().print("3. Run: sheep implement <repo-path> -i '<issue>'")
 
 
 if __name__ == "__main__":
@@ -1,8 +1,25 @@
 """LLM configuration and factory."""
 
+from collections.abc import Callable
+from typing import Any
+
 from crewai import LLM
+from pydantic import SecretStr
+
+from sheep.config.settings import LLMSettings, Settings, get_settings, provider_for_model
+
+# Provider prefix -> API key lookup
+_PROVIDER_KEYS: dict[str, Callable[[LLMSettings], SecretStr | None]] = {
+    "openai": lambda s: s.openai_api_key,
+    "anthropic": lambda s: s.anthropic_api_key,
+    "google": lambda s: s.google_api_key,
+    "cursor": lambda s: s.cursor_api_key,
+}
 
-from sheep.config.settings import Settings, get_settings
+# Provider prefix -> endpoint override, applied only when a key is configured
+_PROVIDER_BASE_URLS: dict[str, Callable[[LLMSettings], str]] = {
+    "cursor": lambda s: s.cursor_api_base,
+}
 
 
 def create_llm(
@@ -31,25 +48,25 @@ def create_llm(
 
     model = model or settings.default_model
 
-    # Build LLM configuration
-    llm_config: dict = {
+    llm_config: dict[str, Any] = {
         "model": model,
         "temperature": temperature,
+        "timeout": settings.llm.request_timeout,
+        "max_retries": settings.llm.max_retries,
     }
 
-    # Add API keys based on provider
-    provider = model.split("/")[0].lower() if "/" in model else "openai"
-
-    if provider == "openai" and settings.llm.openai_api_key:
-        llm_config["api_key"] = settings.llm.openai_api_key.get_secret_value()
-    elif provider == "anthropic" and settings.llm.anthropic_api_key:
-        llm_config["api_key"] = settings.llm.anthropic_api_key.get_secret_value()
-    elif provider in ("google", "gemini") and settings.llm.google_api_key:
-        llm_config["api_key"] = settings.llm.google_api_key.get_secret_value()
-    elif provider == "cursor" and settings.llm.cursor_api_key:
-        llm_config["api_key"] = settings.llm.cursor_api_key.get_secret_value()
-        llm_config["base_url"] = settings.llm.cursor_api_base
-
+    # Add API key and endpoint based on provider
+    provider = provider_for_model(model)
+    key_getter = _PROVIDER_KEYS.get(provider)
+    secret = key_getter(settings.llm) if key_getter else None
+    if secret:
+        llm_config["api_key"] = secret.get_secret_value()
+        base_url_getter = _PROVIDER_BASE_URLS.get(provider)
+        if base_url_getter:
+            llm_config["base_url"] = base_url_getter(settings.llm)
+
+    # A new instance per call: CrewAI accumulates token usage on the LLM
+    # object, so a shared one would report every earlier run's usage too
     return LLM(**llm_config)
 
 
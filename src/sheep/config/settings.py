@@ -1,16 +1,37 @@
 """Application settings using Pydantic Settings."""
 
-from functools import lru_cache
+from functools import cached_property, lru_cache
 from typing import Literal
 
 from pydantic import Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Supported LLM providers, in display order
+PROVIDERS: tuple[str, ...] = ("openai", "anthropic", "google", "cursor")
+
+# Model prefixes that share another provider's credentials
+_PROVIDER_ALIASES: dict[str, str] = {"gemini": "google"}
+
+
+def provider_for_model(model: str) -> str:
+    """
+    Return the provider whose credentials a model identifier uses.
+
+    Models without a "provider/" prefix are treated as OpenAI models.
+    """
+    prefix, sep, _ = model.partition("/")
+    provider = prefix.lower() if sep else "openai"
+    return _PROVIDER_ALIASES.get(provider, provider)
 
-class LLMSettings(BaseSettings):
-    """LLM provider configuration."""
 
-    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+class _SheepSettings(BaseSettings):
+    """Base class for Sheep settings."""
+
+    model_config = SettingsConfigDict(env_file=".env", extra="ignore", frozen=True)
+
+
+class LLMSettings(_SheepSettings):
+    """LLM provider configuration."""
 
     # OpenAI
     openai_api_key: SecretStr | None = Field(default=None, alias="OPENAI_API_KEY")
@@ -27,24 +48,28 @@ class LLMSettings(BaseSettings):
         default="https://api.cursor.sh/v1", alias="CURSOR_API_BASE"
     )
 
+    # Request behaviour (applies to every provider)
+    request_timeout: float = Field(default=600.0, alias="SHEEP_LLM_TIMEOUT")
+    max_retries: int = Field(default=2, alias="SHEEP_LLM_MAX_RETRIES")
+
+    @cached_property
+    def available_providers(self) -> frozenset[str]:
+        """Set of configured providers, computed once."""
+        keys = {
+            "openai": self.openai_api_key,
+            "anthropic": self.anthropic_api_key,
+            "google": self.google_api_key,
+            "cursor": self.cursor_api_key,
+        }
+        return frozenset(provider for provider, key in keys.items() if key)
+
     def get_available_providers(self) -> list[str]:
         """Return list of configured providers."""
-        providers = []
-        if self.openai_api_key:
-            providers.append("openai")
-        if self.anthropic_api_key:
-            providers.append("anthropic")
-        if self.google_api_key:
-            providers.append("google")
-        if self.cursor_api_key:
-            providers.append("cursor")
-        return providers
-
-
-class LangfuseSettings(BaseSettings):
-    """Langfuse observability configuration."""
+        return [p for p in PROVIDERS if p in self.available_providers]
 
-    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
+
+class LangfuseSettings(_SheepSettings):
+    """Langfuse observability configuration."""
 
     public_key: SecretStr | None = Field(default=None, alias="LANGFUSE_PUBLIC_KEY")
     secret_key: SecretStr | None = Field(default=None, alias="LANGFUSE_SECRET_KEY")
@@ -57,6 +82,11 @@ class LangfuseSettings(BaseSettings):
     enabled: bool = Field(default=True, alias="LANGFUSE_ENABLED")
     # Control OpenInference tracing
     openlit_enabled: bool = Field(default=False, alias="LANGFUSE_OPENLIT_ENABLED")
+    # Span batching: export after this many spans or this many seconds
+    flush_at: int = Field(default=100, alias="LANGFUSE_FLUSH_AT")
+    flush_interval: float = Field(default=1.0, alias="LANGFUSE_FLUSH_INTERVAL")
+    # Flush after every flow run instead of only at process exit
+    enforce_flush: bool = Field(default=False, alias="SHEEP_LANGFUSE_ENFORCE_FLUSH")
 
     @property
     def is_configured(self) -> bool:
@@ -64,20 +94,20 @@ class LangfuseSettings(BaseSettings):
         return bool(self.public_key and self.secret_key and self.enabled)
 
 
-class GitSettings(BaseSettings):
+class GitSettings(_SheepSettings):
     """Git configuration."""
 
-    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
-
     remote: str = Field(default="origin", alias="SHEEP_GIT_REMOTE")
     branch_prefix: str = Field(default="sheep/", alias="SHEEP_BRANCH_PREFIX")
+    # Repos whose .git/index is larger than this get a cheaper git status
+    huge_index_bytes: int = Field(default=20 * 1024 * 1024, alias="SHEEP_HUGE_INDEX_BYTES")
+    # Opt in to writing core.untrackedCache into the config of repos sheep works on
+    tune_repo: bool = Field(default=False, alias="SHEEP_GIT_TUNE_REPO")
 
 
-class Settings(BaseSettings):
+class Settings(_SheepSettings):
     """Main application settings."""
 
-    model_config = SettingsConfigDict(env_file=".env", extra="ignore")
-
     # Model configuration
     default_model: str = Field(default="openai/gpt-4o", alias="SHEEP_DEFAULT_MODEL")
     fast_model: str = Field(default="openai/gpt-4o-mini", alias="SHEEP_FAST_MODEL")
@@ -92,11 +122,24 @@ class Settings(BaseSettings):
     verbose: bool = Field(default=False, alias="SHEEP_VERBOSE")
     max_iterations: int = Field(default=25, alias="SHEEP_MAX_ITERATIONS")
 
+    # Per-agent iteration caps
+    max_iter_researcher: int = Field(default=15, alias="SHEEP_MAX_ITER_RESEARCHER")
+    max_iter_implementer: int = Field(default=20, alias="SHEEP_MAX_ITER_IMPLEMENTER")
+    max_iter_reviewer: int = Field(default=10, alias="SHEEP_MAX_ITER_REVIEWER")
+    max_iter_chat: int = Field(default=25, alias="SHEEP_MAX_ITER_CHAT")
+
+    # Docs/tests-only changes smaller than this many lines skip the review stage (0 disables)
+    review_skip_max_lines: int = Field(default=10, alias="SHEEP_REVIEW_SKIP_MAX_LINES")
+
     # Sub-configurations
     llm: LLMSettings = Field(default_factory=LLMSettings)
-    langfuse: LangfuseSettings = Field(default_factory=LangfuseSettings)
     git: GitSettings = Field(default_factory=GitSettings)
 
+    @cached_property
+    def langfuse(self) -> LangfuseSettings:
+        """Langfuse settings, built on first access."""
+        return LangfuseSettings()
+
 
 @lru_cache
 def get_settings() -> Settings:
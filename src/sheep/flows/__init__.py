@@ -1,21 +1,58 @@
-"""Flow definitions for Sheep."""
-
-from sheep.flows.code_implementation import (
-    CodeImplementationFlow,
-    CodeImplementationState,
-    run_code_implementation,
-)
-from sheep.flows.chat import (
-    ChatFlow,
-    ChatState,
-    run_chat,
-)
+"""Flow definitions for Sheep.
+
+Flows are imported lazily (PEP 562) so that importing this package, or a
+lightweight submodule such as ``sheep.flows.runtime``, doesn't pull in CrewAI.
+"""
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from sheep.flows.chat import (
+        ChatFlow,
+        ChatState,
+        run_chat,
+        run_chat_async,
+    )
+    from sheep.flows.code_implementation import (
+        CodeImplementationFlow,
+        CodeImplementationState,
+        run_code_implementation,
+        run_code_implementation_async,
+    )
+
+_EXPORTS = {
+    "CodeImplementationFlow": "sheep.flows.code_implementation",
+    "CodeImplementationState": "sheep.flows.code_implementation",
+    "run_code_implementation": "sheep.flows.code_implementation",
+    "run_code_implementation_async": "sheep.flows.code_implementation",
+    "ChatFlow": "sheep.flows.chat",
+    "ChatState": "sheep.flows.chat",
+    "run_chat": "sheep.flows.chat",
+    "run_chat_async": "sheep.flows.chat",
+}
 
 __all__ = [
     "CodeImplementationFlow",
     "CodeImplementationState",
     "run_code_implementation",
+    "run_code_implementation_async",
     "ChatFlow",
     "ChatState",
     "run_chat",
+    "run_chat_async",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    value = getattr(import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
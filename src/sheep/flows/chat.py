@@ -1,19 +1,130 @@
 """Chat Flow - General Q&A with web search and code exploration."""
 
-import uuid
+import asyncio
+import hashlib
+import subprocess
+import threading
+import time
+from collections import OrderedDict
 from pathlib import Path
+from secrets import token_hex
+from string import Template
 from typing import Any
 
-from crewai import Crew, Task
+from crewai import Crew, CrewOutput, Task
 from crewai.flow.flow import Flow, listen, start
 from pydantic import BaseModel, Field
 
 from sheep.agents import create_chat_agent
 from sheep.config.settings import get_settings
+from sheep.flows.runtime import run_sync
+from sheep.observability import flush_observability, wait_for_observability
 from sheep.observability.logging import AgentLogger, get_logger
 
 _logger = get_logger(__name__)
 
+# Answer task prompt pieces; only the $-placeholders change between runs
+_QUESTION_TEMPLATE = Template(
+    """\
+Answer the following question comprehensively and accurately:
+
+$question
+"""
+)
+_CONTEXT_TEMPLATE = Template(
+    """
+You can explore the codebase at: $context_path
+Use file_read, file_search, and directory_tree tools to understand the code.
+"""
+)
+_GUIDELINES = """
+Guidelines:
+1. IMPORTANT: If you know the official documentation URL for the topic, use web_fetch
+   to directly retrieve it instead of web_search. For example:
+   - Python docs: https://docs.python.org/3/...
+   - FastAPI docs: https://fastapi.tiangolo.com/...
+   - React docs: https://react.dev/...
+2. Only use web_search when you need to discover new URLs or need multiple perspectives
+3. If web_search is rate-limited, adapt and use web_fetch with known documentation URLs
+4. If a codebase path is provided, explore it to understand implementation details
+5. Cite your sources (URLs, file paths, commands run)
+6. Provide practical examples when applicable
+7. If you're not sure, say so - don't make up information
+8. Structure your answer clearly with sections if needed
+"""
+_ANSWER_EXPECTED_OUTPUT = """\
+A comprehensive answer that includes:
+1. Direct answer to the question
+2. Relevant details and explanation
+3. Practical examples if applicable
+4. Sources cited (URLs, file paths, etc.)
+5. Any caveats or additional considerations
+"""
+
+# Answers to repeated questions are reused for this long (seconds)
+_ANSWER_CACHE_TTL = 3600.0
+_ANSWER_CACHE_SIZE = 128
+
+_answer_cache: OrderedDict[str, tuple[float, str]] = OrderedDict()
+_answer_cache_lock = threading.Lock()
+
+
+def _answer_cache_key(question: str, context_path: str | None) -> str | None:
+    """
+    Build the answer cache key for a question, or None if it can't be cached.
+
+    Questions with a context path are only cached when the path is a clean git
+    checkout; its HEAD commit is part of the key, so new commits invalidate
+    earlier answers.
+    """
+    normalized = " ".join(question.split()).casefold()
+    head = ""
+
+    if context_path:
+        try:
+            result = subprocess.run(
+                ["git", "status", "--porcelain=v2", "--branch"],
+                cwd=context_path,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+        except (OSError, subprocess.CalledProcessError):
+            return None  # Not a git repository
+
+        lines = result.stdout.splitlines()
+        if any(not line.startswith("#") for line in lines):
+            return None  # Uncommitted changes
+
+        for line in lines:
+            if line.startswith("# branch.oid "):
+                head = line.removeprefix("# branch.oid ")
+
+    key = f"{normalized}\0{context_path or ''}\0{head}"
+    return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+
+def _get_cached_answer(key: str) -> str | None:
+    """Return a cached answer that hasn't expired yet."""
+    with _answer_cache_lock:
+        entry = _answer_cache.get(key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] > _ANSWER_CACHE_TTL:
+            del _answer_cache[key]
+            return None
+        _answer_cache.move_to_end(key)
+        return entry[1]
+
+
+def _cache_answer(key: str, answer: str) -> None:
+    """Store an answer, evicting the least recently used one when full."""
+    with _answer_cache_lock:
+        _answer_cache[key] = (time.monotonic(), answer)
+        _answer_cache.move_to_end(key)
+        if len(_answer_cache) > _ANSWER_CACHE_SIZE:
+            _answer_cache.popitem(last=False)
+
 
 class ChatState(BaseModel):
     """State for the chat flow."""
@@ -56,12 +167,12 @@ class ChatFlow(Flow[ChatState]):
 
     def __init__(self, verbose: bool | None = None):
         super().__init__()
-        settings = get_settings()
-        self.verbose = verbose if verbose is not None else settings.verbose
+        self._settings = get_settings()
+        self.verbose = verbose if verbose is not None else self._settings.verbose
         self.flow_logger = AgentLogger("chat")
 
     @start()
-    def answer_question(self) -> str:
+    async def answer_question(self) -> str:
         """Answer the user's question using the chat agent."""
         self.flow_logger.action("Answering question")
 
@@ -69,8 +180,9 @@ class ChatFlow(Flow[ChatState]):
 
         # Validate context path if provided
         if state.context_path:
-            context_path = Path(state.context_path).resolve()
-            if not context_path.exists():
+            try:
+                Path(state.context_path).resolve(strict=True)
+            except OSError:
                 state.error = f"Context path does not exist: {state.context_path}"
                 state.final_status = "error"
                 return "error"
@@ -79,46 +191,14 @@ class ChatFlow(Flow[ChatState]):
         chat_agent = create_chat_agent(verbose=self.verbose)
 
         # Build task description with optional context
-        task_description = f"""
-        Answer the following question comprehensively and accurately:
-
-        {state.question}
-        """
-
+        task_description = _QUESTION_TEMPLATE.substitute(question=state.question)
         if state.context_path:
-            task_description += f"""
-
-        You can explore the codebase at: {state.context_path}
-        Use file_read, file_search, and directory_tree tools to understand the code.
-        """
-
-        task_description += """
-
-        Guidelines:
-        1. IMPORTANT: If you know the official documentation URL for the topic, use web_fetch
-           to directly retrieve it instead of web_search. For example:
-           - Python docs: https://docs.python.org/3/...
-           - FastAPI docs: https://fastapi.tiangolo.com/...
-           - React docs: https://react.dev/...
-        2. Only use web_search when you need to discover new URLs or need multiple perspectives
-        3. If web_search is rate-limited, adapt and use web_fetch with known documentation URLs
-        4. If a codebase path is provided, explore it to understand implementation details
-        5. Cite your sources (URLs, file paths, commands run)
-        6. Provide practical examples when applicable
-        7. If you're not sure, say so - don't make up information
-        8. Structure your answer clearly with sections if needed
-        """
+            task_description += _CONTEXT_TEMPLATE.substitute(context_path=state.context_path)
+        task_description += _GUIDELINES
 
         answer_task = Task(
             description=task_description,
-            expected_output="""
-            A comprehensive answer that includes:
-            1. Direct answer to the question
-            2. Relevant details and explanation
-            3. Practical examples if applicable
-            4. Sources cited (URLs, file paths, etc.)
-            5. Any caveats or additional considerations
-            """,
+            expected_output=_ANSWER_EXPECTED_OUTPUT,
             agent=chat_agent,
         )
 
@@ -131,9 +211,10 @@ class ChatFlow(Flow[ChatState]):
         try:
             # OpenInference will automatically capture crew execution details
             # No need to manually wrap - it creates proper trace hierarchy
-            result = crew.kickoff()
+            result = await crew.kickoff_async()
+            assert isinstance(result, CrewOutput)  # The crew doesn't stream
 
-            state.answer = str(result)
+            state.answer = result.raw
             state.final_status = "completed"
             self.flow_logger.result("Question answered successfully")
             return "success"
@@ -172,11 +253,47 @@ def run_chat(
         ... )
         >>> print(result.answer)
     """
+    return run_sync(
+        run_chat_async(
+            question=question,
+            context_path=context_path,
+            verbose=verbose,
+            session_id=session_id,
+            user_id=user_id,
+        )
+    )
+
+
+async def run_chat_async(
+    question: str,
+    context_path: str | None = None,
+    verbose: bool = False,
+    session_id: str | None = None,
+    user_id: str | None = None,
+) -> ChatState:
+    """
+    Run the chat flow without blocking the event loop.
+
+    Takes the same arguments as run_chat(). Use it to answer several
+    questions concurrently, e.g. with asyncio.gather().
+    """
+    cache_key = await asyncio.to_thread(_answer_cache_key, question, context_path)
+    if cache_key is not None:
+        cached = _get_cached_answer(cache_key)
+        if cached is not None:
+            _logger.info("chat_cache_hit", question=question[:100])
+            return ChatState(
+                question=question,
+                context_path=context_path,
+                answer=cached,
+                final_status="completed",
+            )
+
     flow = ChatFlow(verbose=verbose)
 
     # Generate session_id if not provided
     if session_id is None:
-        session_id = f"sheep-chat-{uuid.uuid4().hex[:8]}"
+        session_id = f"sheep-chat-{token_hex(4)}"
 
     # Prepare input
     input_data = {
@@ -184,8 +301,19 @@ def run_chat(
         "context_path": context_path,
     }
 
+    # Make sure background observability init has finished before tracing starts
+    await asyncio.to_thread(wait_for_observability)
+
     # Run the flow - OpenInference will automatically capture all traces
-    flow.kickoff(inputs=input_data)
+    try:
+        await flow.kickoff_async(inputs=input_data)
+    finally:
+        # Spans are batched and sent at exit; flush now only when asked to
+        if get_settings().langfuse.enforce_flush:
+            await asyncio.to_thread(flush_observability)
+
+    if cache_key is not None and flow.state.final_status == "completed" and flow.state.answer:
+        _cache_answer(cache_key, flow.state.answer)
 
     # Set output on the current OpenTelemetry span using semantic conventions
     try:
@@ -1,10 +1,15 @@
 """Code Implementation Flow - From issue to pushed changes."""
 
-import uuid
+import asyncio
+import re
+import subprocess
+from collections.abc import Callable
 from pathlib import Path
+from secrets import token_hex
+from string import Template
 from typing import Any
 
-from crewai import Crew, Task
+from crewai import Crew, CrewOutput, Task
 from crewai.flow.flow import Flow, listen, router, start
 from pydantic import BaseModel, Field
 
@@ -14,6 +19,8 @@ from sheep.agents import (
     create_code_reviewer_agent,
 )
 from sheep.config.settings import get_settings
+from sheep.flows.runtime import run_sync
+from sheep.observability import flush_observability, wait_for_observability
 from sheep.observability.logging import AgentLogger, get_logger
 from sheep.tools import (
     GitCommitTool,
@@ -25,6 +32,127 @@ from sheep.tools import (
 
 _logger = get_logger(__name__)
 
+# Runs of anything but letters and digits become a single dash in branch slugs
+_SLUG_SEPARATOR_RE = re.compile(r"[\W_]+")
+
+# Reviewer verdict line requested in the review task's expected output
+_VERDICT_RE = re.compile(r"VERDICT\W*(PASS|NEEDS_CHANGES)", re.IGNORECASE)
+
+# Paths whose small changes don't need an LLM review
+_LOW_RISK_PATH_RE = re.compile(r"(^|/)(docs?/|tests?/|README(\.\w+)?$)|\.(md|rst)$")
+
+# Dependency pins always get reviewed, even under docs/ or tests/
+_DEPENDENCY_PATH_RE = re.compile(r"(^|/)requirements[^/]*\.txt$")
+
+# Stage prompts; only the $-placeholders change between runs
+_RESEARCH_DESCRIPTION = Template(
+    """\
+Analyze the codebase at $working_path to understand how to implement:
+
+$issue_description
+
+Your research should:
+1. First, explore the project structure to understand the architecture
+2. Find similar implementations or patterns in the codebase
+3. Identify the specific files that need to be modified or created
+4. Understand the coding conventions and patterns used
+5. Identify any dependencies or related code that might be affected
+
+Be thorough but focused. Document:
+- Project structure overview
+- Relevant files and their purposes
+- Existing patterns to follow
+- Specific locations for changes
+- Any potential challenges or considerations
+"""
+)
+_RESEARCH_EXPECTED_OUTPUT = """\
+A research report with:
+- structure: project structure summary
+- files_to_modify: paths of files to modify or create
+- patterns: implementation approach based on existing patterns
+- locations: specific code locations (file:line) for changes
+- risks: any risks or considerations
+- implementation_plan: a compact, step-by-step action plan (at most ~300 words)
+  naming the files, locations and conventions, for the engineer making the change
+"""
+
+_IMPLEMENT_DESCRIPTION = Template(
+    """\
+Based on the research findings, implement the changes for:
+
+$issue_description
+
+Research findings:
+$research_findings
+
+Working directory: $working_path
+
+Guidelines:
+1. Follow the existing code patterns and conventions identified
+2. Make minimal, focused changes - only what's needed
+3. Ensure proper error handling where appropriate
+4. Add comments only where logic isn't self-evident
+5. Do not add unnecessary features or "improvements"
+
+After making changes, verify them with git status and git diff.
+"""
+)
+_IMPLEMENT_EXPECTED_OUTPUT = """\
+A summary of changes made including:
+1. List of files modified/created
+2. Brief description of each change
+3. Any important implementation decisions made
+"""
+
+_REVIEW_DESCRIPTION = Template(
+    """\
+Review the code changes made for:
+
+$issue_description
+
+Working directory: $working_path
+
+Changes made:
+$changes_made
+
+Review criteria:
+1. Correctness: Does the code correctly implement the requirement?
+2. Code quality: Is the code clean, readable, and maintainable?
+3. Conventions: Does it follow the project's existing patterns?
+4. Security: Are there any security vulnerabilities?
+5. Edge cases: Are edge cases handled appropriately?
+
+Use git diff to see the actual changes.
+Provide specific, actionable feedback if changes are needed.
+"""
+)
+_REVIEW_EXPECTED_OUTPUT = """\
+Review result with:
+1. A first line reading exactly "VERDICT: PASS" or "VERDICT: NEEDS_CHANGES"
+2. Summary of findings
+3. Specific issues (if any) with file:line references
+4. Suggested fixes (if any)
+"""
+
+
+class ResearchReport(BaseModel):
+    """Structured output of the research stage."""
+
+    structure: str = Field(description="Summary of the project structure and architecture")
+    files_to_modify: list[str] = Field(
+        default_factory=list, description="Paths of files to modify or create"
+    )
+    patterns: str = Field(description="Existing patterns and conventions to follow")
+    locations: list[str] = Field(
+        default_factory=list, description="Specific code locations (file:line) for changes"
+    )
+    risks: str = Field(default="", description="Risks or considerations for the change")
+    implementation_plan: str = Field(
+        default="",
+        description="Concise step-by-step plan naming files, locations and conventions to follow",
+    )
+
 
 class CodeImplementationState(BaseModel):
     """State for the code implementation flow."""
@@ -59,6 +187,64 @@ class CodeImplementationState(BaseModel):
     error: str | None = Field(default=None)
 
 
+async def _kickoff(crew: Crew) -> CrewOutput:
+    """Run a crew and return its output; the crews in this flow never stream."""
+    result = await crew.kickoff_async()
+    assert isinstance(result, CrewOutput)
+    return result
+
+
+def _is_low_risk_path(path: str) -> bool:
+    """Whether a changed path is docs or tests only."""
+    return bool(_LOW_RISK_PATH_RE.search(path)) and not _DEPENDENCY_PATH_RE.search(path)
+
+
+def _low_risk_change_size(working_path: str) -> int | None:
+    """
+    Count changed lines if every changed path is docs or tests.
+
+    Returns None when nothing changed, any other file changed or git can't be queried.
+    """
+    try:
+        diff = subprocess.run(
+            ["git", "diff", "--numstat", "HEAD"],
+            cwd=working_path,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        untracked = subprocess.run(
+            ["git", "ls-files", "--others", "--exclude-standard"],
+            cwd=working_path,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+    if not diff.stdout and not untracked.stdout:
+        return None  # A no-op implementation still goes to review
+
+    total = 0
+    for line in diff.stdout.splitlines():
+        added, deleted, path = line.split("\t", 2)
+        if not _is_low_risk_path(path) or added == "-":
+            return None  # Source or binary change
+        total += int(added) + int(deleted)
+
+    for path in untracked.stdout.splitlines():
+        if not _is_low_risk_path(path):
+            return None
+        try:
+            with open(Path(working_path) / path, "rb") as f:
+                total += sum(1 for _ in f)
+        except OSError:
+            return None
+
+    return total
+
+
 class CodeImplementationFlow(Flow[CodeImplementationState]):
     """
     Flow for implementing code changes from an issue description.
@@ -79,33 +265,36 @@ class CodeImplementationFlow(Flow[CodeImplementationState]):
         ... )
     """
 
-    def __init__(self, verbose: bool | None = None):
+    def __init__(self, verbose: bool | None = None, stream: bool = False):
         super().__init__()
-        settings = get_settings()
-        self.verbose = verbose if verbose is not None else settings.verbose
+        self._settings = get_settings()
+        self.verbose = verbose if verbose is not None else self._settings.verbose
+        self.stream = stream
         self.flow_logger = AgentLogger("flow")
 
+    def _step_callback(self, agent_name: str) -> Callable[[Any], None] | None:
+        """Return a callback that prints each agent step when streaming."""
+        return AgentLogger(agent_name).step if self.stream else None
+
     @start()
     def setup_branch(self) -> str:
         """Create branch and set up working directory."""
         self.flow_logger.action("Setting up branch")
 
         state = self.state
-        repo_path = Path(state.repo_path).resolve()
-
-        if not repo_path.exists():
-            state.error = f"Repository path does not exist: {repo_path}"
+        # A strict resolve checks existence in the same realpath walk
+        try:
+            repo_path = Path(state.repo_path).resolve(strict=True)
+        except OSError:
+            state.error = f"Repository path does not exist: {state.repo_path}"
             state.final_status = "error"
             return "error"
 
         # Generate branch name if not provided
         if not state.branch_name:
-            settings = get_settings()
             # Create a simple slug from issue description
-            slug = state.issue_description[:50].lower()
-            slug = "".join(c if c.isalnum() else "-" for c in slug)
-            slug = "-".join(filter(None, slug.split("-")))
-            state.branch_name = f"{settings.git.branch_prefix}{slug}"
+            slug = _SLUG_SEPARATOR_RE.sub("-", state.issue_description[:50].lower()).strip("-")
+            state.branch_name = f"{self._settings.git.branch_prefix}{slug}"
 
         try:
             if state.use_worktree:
@@ -138,7 +327,7 @@ class CodeImplementationFlow(Flow[CodeImplementationState]):
             return "error"
 
     @listen(setup_branch)
-    def research_codebase(self, setup_result: str) -> str:
+    async def research_codebase(self, setup_result: str) -> str:
         """Research the codebase to understand implementation needs."""
         if setup_result == "error":
             return "error"
@@ -146,37 +335,19 @@ class CodeImplementationFlow(Flow[CodeImplementationState]):
         self.flow_logger.action("Researching codebase")
         state = self.state
 
-        researcher = create_code_researcher_agent(verbose=self.verbose)
+        researcher = create_code_researcher_agent(
+            verbose=self.verbose,
+            step_callback=self._step_callback("researcher"),
+        )
 
         research_task = Task(
-            description=f"""
-            Analyze the codebase at {state.working_path} to understand how to implement:
-
-            {state.issue_description}
-
-            Your research should:
-            1. First, explore the project structure to understand the architecture
-            2. Find similar implementations or patterns in the codebase
-            3. Identify the specific files that need to be modified or created
-            4. Understand the coding conventions and patterns used
-            5. Identify any dependencies or related code that might be affected
-
-            Be thorough but focused. Document:
-            - Project structure overview
-            - Relevant files and their purposes
-            - Existing patterns to follow
-            - Specific locations for changes
-            - Any potential challenges or considerations
-            """,
-            expected_output="""
-            A detailed research report containing:
-            1. Project structure summary
-            2. List of files to modify with reasons
-            3. Implementation approach based on existing patterns
-            4. Specific code locations (file:line) for changes
-            5. Any risks or considerations
-            """,
+            description=_RESEARCH_DESCRIPTION.substitute(
+                working_path=state.working_path,
+                issue_description=state.issue_description,
+            ),
+            expected_output=_RESEARCH_EXPECTED_OUTPUT,
             agent=researcher,
+            output_pydantic=ResearchReport,
         )
 
         crew = Crew(
@@ -187,9 +358,16 @@ class CodeImplementationFlow(Flow[CodeImplementationState]):
 
         try:
             # OpenInference will automatically capture crew execution details
-            result = crew.kickoff()
+            result = await _kickoff(crew)
 
-            state.research_findings = str(result)
+            report = result.pydantic
+            if isinstance(report, ResearchReport):
+                state.research_findings = report.model_dump_json(indent=2)
+                state.files_to_modify = report.files_to_modify
+                state.implementation_plan = report.implementation_plan or None
+            else:
+                # The model didn't return the schema; keep its free-form answer
+                state.research_findings = result.raw
             self.flow_logger.result(f"Research completed: {len(state.research_findings)} chars")
             return "success"
         except Exception as e:
@@ -199,7 +377,7 @@ class CodeImplementationFlow(Flow[CodeImplementationState]):
             return "error"
 
     @listen(research_codebase)
-    def implement_changes(self, research_result: str) -> str:
+    async def implement_changes(self, research_result: str) -> str:
         """Implement the required code changes."""
         if research_result == "error":
             return "error"
@@ -207,34 +385,18 @@ class CodeImplementationFlow(Flow[CodeImplementationState]):
         self.flow_logger.action("Implementing changes")
         state = self.state
 
-        implementer = create_code_implementer_agent(verbose=self.verbose)
+        implementer = create_code_implementer_agent(
+            verbose=self.verbose,
+            step_callback=self._step_callback("implementer"),
+        )
 
         implementation_task = Task(
-            description=f"""
-            Based on the research findings, implement the changes for:
-
-            {state.issue_description}
-
-            Research findings:
-            {state.research_findings}
-
-            Working directory: {state.working_path}
-
-            Guidelines:
-            1. Follow the existing code patterns and conventions identified
-            2. Make minimal, focused changes - only what's needed
-            3. Ensure proper error handling where appropriate
-            4. Add comments only where logic isn't self-evident
-            5. Do not add unnecessary features or "improvements"
-
-            After making changes, verify them with git status and git diff.
-            """,
-            expected_output="""
-            A summary of changes made including:
-            1. List of files modified/created
-            2. Brief description of each change
-            3. Any important implementation decisions made
-            """,
+            description=_IMPLEMENT_DESCRIPTION.substitute(
+                issue_description=state.issue_description,
+                research_findings=state.implementation_plan or state.research_findings,
+                working_path=state.working_path,
+            ),
+            expected_output=_IMPLEMENT_EXPECTED_OUTPUT,
             agent=implementer,
         )
 
@@ -246,9 +408,9 @@ class CodeImplementationFlow(Flow[CodeImplementationState]):
 
         try:
             # OpenInference will automatically capture crew execution details
-            result = crew.kickoff()
+            result = await _kickoff(crew)
 
-            state.changes_made = str(result)
+            state.changes_made = result.raw
             self.flow_logger.result(f"Implementation completed")
             return "success"
         except Exception as e:
@@ -258,7 +420,7 @@ class CodeImplementationFlow(Flow[CodeImplementationState]):
             return "error"
 
     @listen(implement_changes)
-    def review_changes(self, impl_result: str) -> str:
+    async def review_changes(self, impl_result: str) -> str:
         """Review the implemented changes."""
         if impl_result == "error":
             return "error"
@@ -272,36 +434,28 @@ class CodeImplementationFlow(Flow[CodeImplementationState]):
             state.review_passed = True  # Accept after 3 iterations
             return "passed"
 
-        reviewer = create_code_reviewer_agent(verbose=self.verbose)
+        # Small docs/tests-only changes skip the reviewer crew entirely
+        max_lines = self._settings.review_skip_max_lines
+        if max_lines > 0:
+            changed = await asyncio.to_thread(_low_risk_change_size, state.working_path)
+            if changed is not None and 0 < changed < max_lines:
+                state.review_result = f"AUTO-PASS (trivial change: {changed} lines in docs/tests)"
+                state.review_passed = True
+                self.flow_logger.result("Review skipped for trivial change")
+                return "passed"
+
+        reviewer = create_code_reviewer_agent(
+            verbose=self.verbose,
+            step_callback=self._step_callback("reviewer"),
+        )
 
         review_task = Task(
-            description=f"""
-            Review the code changes made for:
-
-            {state.issue_description}
-
-            Working directory: {state.working_path}
-
-            Changes made:
-            {state.changes_made}
-
-            Review criteria:
-            1. Correctness: Does the code correctly implement the requirement?
-            2. Code quality: Is the code clean, readable, and maintainable?
-            3. Conventions: Does it follow the project's existing patterns?
-            4. Security: Are there any security vulnerabilities?
-            5. Edge cases: Are edge cases handled appropriately?
-
-            Use git diff to see the actual changes.
-            Provide specific, actionable feedback if changes are needed.
-            """,
-            expected_output="""
-            Review result with:
-            1. VERDICT: PASS or NEEDS_CHANGES
-            2. Summary of findings
-            3. Specific issues (if any) with file:line references
-            4. Suggested fixes (if any)
-            """,
+            description=_REVIEW_DESCRIPTION.substitute(
+                issue_description=state.issue_description,
+                working_path=state.working_path,
+                changes_made=state.changes_made,
+            ),
+            expected_output=_REVIEW_EXPECTED_OUTPUT,
             agent=reviewer,
         )
 
@@ -313,13 +467,13 @@ class CodeImplementationFlow(Flow[CodeImplementationState]):
 
         try:
             # OpenInference will automatically capture crew execution details
-            result = crew.kickoff()
+            result = await _kickoff(crew)
 
-            state.review_result = str(result)
+            state.review_result = result.raw
 
             # Check if review passed
-            result_lower = state.review_result.lower()
-            if "pass" in result_lower and "needs_changes" not in result_lower:
+            verdict = _VERDICT_RE.search(state.review_result)
+            if verdict and verdict.group(1).upper() == "PASS":
                 state.review_passed = True
                 self.flow_logger.result("Review PASSED")
                 return "passed"
@@ -336,13 +490,13 @@ class CodeImplementationFlow(Flow[CodeImplementationState]):
     def route_after_review(self, review_result: str) -> str:
         """Route based on review outcome."""
         if review_result == "passed":
-            return "commit_and_push"
+            return "commit"
         elif review_result == "needs_changes":
             return "implement_changes"
         else:
-            return "commit_and_push"
+            return "commit"
 
-    @listen("commit_and_push")
+    @listen("commit")
     def commit_and_push(self) -> str:
         """Commit changes and push to remote."""
         self.flow_logger.action("Committing and pushing")
@@ -369,15 +523,18 @@ Changes:
             )
             self.flow_logger.result(f"Commit: {commit_result}")
 
-            # Push if auto_push enabled
-            if state.auto_push:
+            # Push if auto_push enabled; with nothing committed there is nothing
+            # to publish, so skip the network round trip
+            nothing_committed = commit_result.startswith("Nothing to commit")
+            if state.auto_push and not nothing_committed:
                 push_tool = GitPushTool()
                 push_result = push_tool._run(
                     repo_path=state.working_path,
+                    remote=self._settings.git.remote,
                     branch=state.branch_name,
                 )
                 self.flow_logger.result(f"Push: {push_result}")
-                state.pushed = True
+                state.pushed = push_result.startswith("Pushed")
 
             state.final_status = "completed"
             return "success"
@@ -389,6 +546,64 @@ Changes:
             return "error"
 
 
+def _prepare_flow(
+    repo_path: str,
+    issue_description: str,
+    branch_name: str | None,
+    use_worktree: bool,
+    auto_push: bool,
+    verbose: bool,
+    stream: bool,
+    session_id: str | None,
+) -> tuple[CodeImplementationFlow, dict[str, Any]]:
+    """Build the flow and its kickoff inputs."""
+    flow = CodeImplementationFlow(verbose=verbose, stream=stream)
+
+    # Generate session_id if not provided (repo-based session)
+    if session_id is None:
+        repo_name = Path(repo_path).name
+        session_id = f"sheep-{repo_name}-{token_hex(4)}"
+
+    # Prepare input
+    input_data = {
+        "repo_path": repo_path,
+        "issue_description": issue_description,
+        "branch_name": branch_name,
+        "use_worktree": use_worktree,
+        "auto_push": auto_push,
+    }
+    return flow, input_data
+
+
+def _record_output(state: CodeImplementationState) -> None:
+    """
+    Update the current OpenTelemetry span with the final output.
+
+    This ensures we see the actual results instead of just "success".
+    """
+    try:
+        from opentelemetry import trace
+
+        current_span = trace.get_current_span()
+        if current_span and current_span.is_recording():
+            # Set output attributes on the current span
+            output_data = {
+                "final_status": state.final_status,
+                "branch_name": state.branch_name,
+                "working_path": state.working_path,
+                "changes_made": state.changes_made[:500] if state.changes_made else None,
+                "pushed": str(state.pushed),
+                "review_iterations": str(state.review_iterations),
+                "error": state.error,
+            }
+            # Set as span attributes (OpenTelemetry format)
+            for key, value in output_data.items():
+                if value is not None:
+                    current_span.set_attribute(f"output.{key}", str(value))
+    except Exception:
+        pass  # Ignore errors in span updates
+
+
 def run_code_implementation(
     repo_path: str,
     issue_description: str,
@@ -396,6 +611,7 @@ def run_code_implementation(
     use_worktree: bool = False,
     auto_push: bool = True,
     verbose: bool = False,
+    stream: bool = False,
     session_id: str | None = None,
     user_id: str | None = None,
 ) -> CodeImplementationState:
@@ -409,6 +625,7 @@ def run_code_implementation(
         use_worktree: Use git worktree for isolated development.
         auto_push: Automatically push changes after commit.
         verbose: Enable verbose output.
+        stream: Print each agent step as it happens.
         session_id: Optional session ID for grouping related flows.
         user_id: Optional user ID for tracking user-specific executions.
 
@@ -425,48 +642,66 @@ def run_code_implementation(
         >>> print(result.final_status)
         completed
     """
-    flow = CodeImplementationFlow(verbose=verbose)
+    return run_sync(
+        run_code_implementation_async(
+            repo_path=repo_path,
+            issue_description=issue_description,
+            branch_name=branch_name,
+            use_worktree=use_worktree,
+            auto_push=auto_push,
+            verbose=verbose,
+            stream=stream,
+            session_id=session_id,
+            user_id=user_id,
+        )
+    )
 
-    # Generate session_id if not provided (repo-based session)
-    if session_id is None:
-        repo_name = Path(repo_path).name
-        session_id = f"sheep-{repo_name}-{uuid.uuid4().hex[:8]}"
 
-    # Prepare input
-    input_data = {
-        "repo_path": repo_path,
-        "issue_description": issue_description,
-        "branch_name": branch_name,
-        "use_worktree": use_worktree,
-        "auto_push": auto_push,
-    }
+async def run_code_implementation_async(
+    repo_path: str,
+    issue_description: str,
+    branch_name: str | None = None,
+    use_worktree: bool = False,
+    auto_push: bool = True,
+    verbose: bool = False,
+    stream: bool = False,
+    session_id: str | None = None,
+    user_id: str | None = None,
+) -> CodeImplementationState:
+    """
+    Run the code implementation flow without blocking the event loop.
+
+    Takes the same arguments as run_code_implementation(). Use it to drive
+    several repositories concurrently, e.g. with asyncio.gather().
+
+    Example:
+        >>> results = await asyncio.gather(
+        ...     run_code_implementation_async("/path/to/api", "Add rate limiting"),
+        ...     run_code_implementation_async("/path/to/web", "Add logout button"),
+        ... )
+    """
+    flow, input_data = _prepare_flow(
+        repo_path,
+        issue_description,
+        branch_name,
+        use_worktree,
+        auto_push,
+        verbose,
+        stream,
+        session_id,
+    )
+
+    # Make sure background observability init has finished before tracing starts
+    await asyncio.to_thread(wait_for_observability)
 
     # Run the flow - OpenInference will automatically capture all traces
     # including input, output, and detailed execution steps
-    flow.kickoff(inputs=input_data)
-
-    # Update the current OpenTelemetry span with the final output
-    # This ensures we see the actual results instead of just "success"
     try:
-        from opentelemetry import trace
-
-        current_span = trace.get_current_span()
-        if current_span and current_span.is_recording():
-            # Set output attributes on the current span
-            output_data = {
-                "final_status": flow.state.final_status,
-                "branch_name": flow.state.branch_name,
-                "working_path": flow.state.working_path,
-                "changes_made": flow.state.changes_made[:500] if flow.state.changes_made else None,
-                "pushed": str(flow.state.pushed),
-                "review_iterations": str(flow.state.review_iterations),
-                "error": flow.state.error,
-            }
-            # Set as span attributes (OpenTelemetry format)
-            for key, value in output_data.items():
-                if value is not None:
-                    current_span.set_attribute(f"output.{key}", str(value))
-    except Exception:
-        pass  # Ignore errors in span updates
+        await flow.kickoff_async(inputs=input_data)
+    finally:
+        # Spans are batched and sent at exit; flush now only when asked to
+        if get_settings().langfuse.enforce_flush:
+            await asyncio.to_thread(flush_observability)
 
+    _record_output(flow.state)
     return flow.state
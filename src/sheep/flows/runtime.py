@@ -0,0 +1,42 @@
+"""Event loop helpers for running flows from synchronous code."""
+
+import asyncio
+from collections.abc import Callable, Coroutine
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
+
+
+def _loop_runner() -> Callable[[Coroutine[Any, Any, _T]], _T]:
+    """Return uvloop's runner when installed, otherwise asyncio's."""
+    try:
+        import uvloop
+
+        return uvloop.run
+    except ImportError:
+        return asyncio.run
+
+
+def run_sync(coro: Coroutine[Any, Any, _T]) -> _T:
+    """
+    Run a coroutine to completion from synchronous code.
+
+    Uses uvloop when it is installed. If an event loop is already running in
+    this thread (e.g. in a notebook), the coroutine runs on a fresh loop in a
+    worker thread instead.
+
+    Args:
+        coro: Coroutine to run.
+
+    Returns:
+        The coroutine's result.
+    """
+    runner = _loop_runner()
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return runner(coro)
+
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(runner, coro).result()
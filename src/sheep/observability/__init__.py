@@ -1,10 +1,18 @@
 """Observability and tracing for Sheep."""
 
-from sheep.observability.langfuse_client import init_observability
+from sheep.observability.langfuse_client import (
+    flush_observability,
+    init_observability,
+    init_observability_in_background,
+    wait_for_observability,
+)
 from sheep.observability.logging import get_logger, setup_logging
 
 __all__ = [
+    "flush_observability",
     "get_logger",
     "init_observability",
+    "init_observability_in_background",
     "setup_logging",
+    "wait_for_observability",
 ]
@@ -1,52 +1,99 @@
 """Langfuse integration for observability."""
 
+import atexit
 import base64
 import os
+import threading
 from typing import Any
 
-from langfuse import get_client
-
-from sheep.config.settings import get_settings
+from sheep.config.settings import Settings, get_settings
 from sheep.observability.logging import get_logger
 
 _instrumented = False
+_init_thread: threading.Thread | None = None
+_client: Any = None
 _logger = get_logger(__name__)
 
 
-def init_observability() -> None:
-    """
-    Initialize Langfuse observability following official CrewAI integration guide.
+def _set_env(values: dict[str, str]) -> None:
+    """Export environment variables, skipping ones that already hold the value."""
+    for key, value in values.items():
+        if os.environ.get(key) != value:
+            os.environ[key] = value
 
-    See: https://langfuse.com/integrations/frameworks/crewai
-    """
-    global _instrumented
 
-    # Only instrument once
-    if _instrumented:
-        return
-
-    settings = get_settings()
+def _export_env(settings: Settings) -> None:
+    """Set the Langfuse and, if tracing is enabled, the OTLP environment variables."""
+    public_key = settings.langfuse.public_key.get_secret_value()
+    secret_key = settings.langfuse.secret_key.get_secret_value()
+    _set_env(
+        {
+            "LANGFUSE_PUBLIC_KEY": public_key,
+            "LANGFUSE_SECRET_KEY": secret_key,
+            "LANGFUSE_BASE_URL": settings.langfuse.host,
+        }
+    )
 
-    if not settings.langfuse.is_configured:
-        _logger.info("Langfuse not configured, observability disabled")
+    if not settings.langfuse.openlit_enabled:
         return
 
-    # Optional: Verify authentication
-    try:
-        os.environ["LANGFUSE_PUBLIC_KEY"] = settings.langfuse.public_key.get_secret_value()
-        os.environ["LANGFUSE_SECRET_KEY"] = settings.langfuse.secret_key.get_secret_value()
-        os.environ["LANGFUSE_BASE_URL"] = settings.langfuse.host
-
-        client = get_client()
-        if not client.auth_check():
-            _logger.warning("Langfuse authentication failed")
+    # Configure OTLP endpoint with Basic Auth
+    auth_string = base64.b64encode(f"{public_key}:{secret_key}".encode()).decode()
+    resource_attributes = ",".join(
+        (
+            "service.name=sheep-agents",
+            "deployment.environment=local",
+            f"gen_ai.request.model={settings.default_model}",
+            f"llm.model={settings.default_model}",
+        )
+    )
+
+    # Set OTLP environment variables (official method), including the default model
+    _set_env(
+        {
+            "OTEL_EXPORTER_OTLP_ENDPOINT": _otlp_endpoint(settings),
+            "OTEL_EXPORTER_OTLP_HEADERS": f"Authorization=Basic {auth_string}",
+            "OTEL_TRACES_EXPORTER": "otlp",
+            "OTEL_EXPORTER_OTLP_PROTOCOL": "http/protobuf",
+            "OTEL_SERVICE_NAME": "sheep-agents",
+            "OTEL_RESOURCE_ATTRIBUTES": resource_attributes,
+        }
+    )
+
+
+def _otlp_endpoint(settings: Settings) -> str:
+    """Return the Langfuse OTLP traces endpoint."""
+    return f"{settings.langfuse.host}/api/public/otel/v1/traces"
+
+
+def _connect(settings: Settings) -> None:
+    """Authenticate the Langfuse client and instrument CrewAI; the environment must be set."""
+    global _client, _instrumented
+
+    # Optional: Verify authentication. Done once; a later call only retries
+    # the instrumentation step below
+    if _client is None:
+        try:
+            from langfuse import Langfuse
+
+            # Spans are exported from a background batch queue. This client becomes
+            # the SDK's default one, so later get_client() calls reuse it
+            client = Langfuse(
+                flush_at=settings.langfuse.flush_at,
+                flush_interval=settings.langfuse.flush_interval,
+            )
+            if not client.auth_check():
+                _logger.warning("Langfuse authentication failed")
+                return
+
+            # Send whatever is still queued once, when the process exits
+            _client = client
+            atexit.register(client.shutdown)
+            _logger.info("Langfuse authenticated", host=settings.langfuse.host)
+        except Exception as e:
+            _logger.warning("Failed to authenticate with Langfuse", error=str(e))
             return
 
-        _logger.info("Langfuse authenticated", host=settings.langfuse.host)
-    except Exception as e:
-        _logger.warning("Failed to authenticate with Langfuse", error=str(e))
-        return
-
     # Enable OpenInference CrewAI instrumentation if configured
     if not settings.langfuse.openlit_enabled:
         _logger.info("OpenInference tracing disabled (set LANGFUSE_OPENLIT_ENABLED=true to enable)")
@@ -55,31 +102,13 @@ def init_observability() -> None:
     try:
         from openinference.instrumentation.crewai import CrewAIInstrumentor
 
-        # Configure OTLP endpoint with Basic Auth
-        endpoint = f"{settings.langfuse.host}/api/public/otel/v1/traces"
-        credentials = f"{settings.langfuse.public_key.get_secret_value()}:{settings.langfuse.secret_key.get_secret_value()}"
-        auth_string = base64.b64encode(credentials.encode()).decode()
-
-        # Set OTLP environment variables (official method)
-        os.environ["OTEL_EXPORTER_OTLP_ENDPOINT"] = endpoint
-        os.environ["OTEL_EXPORTER_OTLP_HEADERS"] = f"Authorization=Basic {auth_string}"
-        os.environ["OTEL_TRACES_EXPORTER"] = "otlp"
-        os.environ["OTEL_EXPORTER_OTLP_PROTOCOL"] = "http/protobuf"
-        os.environ["OTEL_SERVICE_NAME"] = "sheep-agents"
-
-        # Set resource attributes including default model
-        os.environ["OTEL_RESOURCE_ATTRIBUTES"] = (
-            f"service.name=sheep-agents,"
-            f"deployment.environment=local,"
-            f"gen_ai.request.model={settings.default_model},"
-            f"llm.model={settings.default_model}"
-        )
-
         # Instrument CrewAI - this is all we need!
         CrewAIInstrumentor().instrument(skip_dep_check=True)
 
         _instrumented = True
-        _logger.info("OpenInference CrewAI instrumentation enabled", endpoint=endpoint)
+        _logger.info(
+            "OpenInference CrewAI instrumentation enabled", endpoint=_otlp_endpoint(settings)
+        )
 
     except ImportError as e:
         _logger.warning(
@@ -90,3 +119,71 @@ def init_observability() -> None:
         _logger.warning("Failed to initialize OpenInference", error=str(e))
 
 
+def _configured_settings() -> Settings | None:
+    """Return the settings if Langfuse is configured and not yet instrumented."""
+    # Only instrument once
+    if _instrumented:
+        return None
+
+    settings = get_settings()
+    if not settings.langfuse.is_configured:
+        _logger.info("Langfuse not configured, observability disabled")
+        return None
+    return settings
+
+
+def init_observability() -> None:
+    """
+    Initialize Langfuse observability following official CrewAI integration guide.
+
+    See: https://langfuse.com/integrations/frameworks/crewai
+    """
+    settings = _configured_settings()
+    if settings is None:
+        return
+
+    _export_env(settings)
+    _connect(settings)
+
+
+def init_observability_in_background() -> None:
+    """
+    Start init_observability() with its network-bound part in a background thread.
+
+    The Langfuse auth check can then overlap with the heavy CrewAI imports a
+    command does next. The environment variables are set before the thread
+    starts: those imports read os.environ, and writing it from another thread
+    at the same time isn't safe. Call wait_for_observability() before the
+    first crew kickoff so its traces are captured.
+    """
+    global _init_thread
+
+    if _init_thread is not None:
+        return
+
+    settings = _configured_settings()
+    if settings is None:
+        return
+
+    _export_env(settings)
+    _init_thread = threading.Thread(
+        target=_connect, args=(settings,), name="sheep-observability-init", daemon=True
+    )
+    _init_thread.start()
+
+
+def wait_for_observability() -> None:
+    """Block until a background init_observability() call has finished."""
+    if _init_thread is not None:
+        _init_thread.join()
+
+
+def flush_observability() -> None:
+    """Send any spans still queued in the Langfuse client."""
+    if _client is None:
+        return
+
+    try:
+        _client.flush()
+    except Exception as e:
+        _logger.warning("Failed to flush Langfuse", error=str(e))
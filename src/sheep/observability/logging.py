@@ -6,6 +6,7 @@ from typing import Any
 
 import structlog
 from rich.console import Console
+from rich.markup import escape
 
 from sheep.config.settings import get_settings
 
@@ -25,6 +26,14 @@ def setup_logging(log_level: str | None = None) -> None:
     # Convert log level string to logging level constant
     log_level_int = getattr(logging, level.upper(), logging.INFO)
 
+    # Colored console output for people, JSON (much cheaper to render) for CI/batch runs
+    interactive = sys.stderr.isatty()
+    renderer = (
+        structlog.dev.ConsoleRenderer(colors=True)
+        if interactive
+        else structlog.processors.JSONRenderer()
+    )
+
     # Configure structlog
     structlog.configure(
         processors=[
@@ -33,7 +42,7 @@ def setup_logging(log_level: str | None = None) -> None:
             structlog.processors.StackInfoRenderer(),
             structlog.dev.set_exc_info,
             structlog.processors.TimeStamper(fmt="iso"),
-            structlog.dev.ConsoleRenderer(colors=True),
+            renderer,
         ],
         wrapper_class=structlog.make_filtering_bound_logger(log_level_int),
         context_class=dict,
@@ -55,35 +64,61 @@ def get_logger(name: str) -> structlog.BoundLogger:
     return structlog.get_logger(name)
 
 
+# Shared by every AgentLogger; each one binds its agent name instead of getting
+# its own per-name logger
+_agent_logger = get_logger("agent")
+
+
 class AgentLogger:
     """Logger wrapper for agent execution with rich output."""
 
     def __init__(self, agent_name: str, flow_id: str | None = None):
         self.agent_name = agent_name
         self.flow_id = flow_id
-        self._logger = get_logger(f"agent.{agent_name}")
+        self._logger = _agent_logger.bind(agent=agent_name)
+
+        # Rich output is only for interactive runs; otherwise structlog alone is enough
+        level = getattr(logging, get_settings().log_level, logging.INFO)
+        self._rich = _console.is_terminal and level <= logging.INFO
+        name = escape(f"[{agent_name}]")
+        self._prefix = f"[cyan]{name}[/cyan]"
+        self._dim_prefix = f"[dim cyan]{name}[/dim cyan]"
 
     def thinking(self, message: str, **kwargs: Any) -> None:
         """Log agent thinking/reasoning."""
-        _console.print(f"[dim cyan][{self.agent_name}][/dim cyan] [dim]{message}[/dim]")
+        if self._rich:
+            _console.print(f"{self._dim_prefix} [dim]{escape(message)}[/dim]")
         self._logger.debug("thinking", message=message, **kwargs)
 
     def action(self, action: str, **kwargs: Any) -> None:
         """Log agent action."""
-        _console.print(f"[cyan][{self.agent_name}][/cyan] [bold]{action}[/bold]")
+        if self._rich:
+            _console.print(f"{self._prefix} [bold]{escape(action)}[/bold]")
         self._logger.info("action", action=action, **kwargs)
 
     def tool_call(self, tool: str, **kwargs: Any) -> None:
         """Log tool invocation."""
-        _console.print(f"[cyan][{self.agent_name}][/cyan] [yellow]Tool:[/yellow] {tool}")
+        if self._rich:
+            _console.print(f"{self._prefix} [yellow]Tool:[/yellow] {escape(tool)}")
         self._logger.info("tool_call", tool=tool, **kwargs)
 
+    def step(self, step: Any) -> None:
+        """Log an intermediate agent step; usable as a CrewAI step_callback."""
+        tool = getattr(step, "tool", None)
+        if tool:
+            self.tool_call(tool, tool_input=str(getattr(step, "tool_input", ""))[:200])
+        else:
+            thought = getattr(step, "thought", None) or getattr(step, "output", step)
+            self.thinking(str(thought)[:200])
+
     def result(self, result: str, **kwargs: Any) -> None:
         """Log agent result."""
-        _console.print(f"[cyan][{self.agent_name}][/cyan] [green]Result:[/green] {result[:200]}...")
+        if self._rich:
+            _console.print(f"{self._prefix} [green]Result:[/green] {escape(result[:200])}...")
         self._logger.info("result", result=result[:500], **kwargs)
 
     def error(self, error: str, **kwargs: Any) -> None:
         """Log agent error."""
-        _console.print(f"[cyan][{self.agent_name}][/cyan] [red]Error:[/red] {error}")
+        if self._rich:
+            _console.print(f"{self._prefix} [red]Error:[/red] {escape(error)}")
         self._logger.error("error", error=error, **kwargs)
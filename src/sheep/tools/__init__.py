@@ -1,5 +1,11 @@
 """Custom tools for Sheep agents."""
 
+from collections.abc import Callable
+from functools import cache
+from typing import TypeVar
+
+from crewai.tools import BaseTool
+
 from sheep.tools.git_tools import (
     GitCheckoutTool,
     GitCommitTool,
@@ -22,7 +28,28 @@ from sheep.tools.web_tools import (
     ShellCommandTool,
 )
 
+_ToolT = TypeVar("_ToolT", bound=BaseTool)
+
+
+@cache
+def get_tool(tool_cls: Callable[[], _ToolT]) -> _ToolT:
+    """
+    Get the shared instance of a tool class.
+
+    Tools are stateless, so one instance per class is reused by every agent
+    instead of constructing a fresh copy per agent factory call.
+
+    Args:
+        tool_cls: Tool class to instantiate.
+
+    Returns:
+        Process-wide instance of the tool.
+    """
+    return tool_cls()
+
+
 __all__ = [
+    "get_tool",
     # Git tools
     "GitCheckoutTool",
     "GitCommitTool",
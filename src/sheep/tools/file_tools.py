@@ -1,16 +1,59 @@
 """File operation tools for agents."""
 
 import os
+import stat
 import subprocess
+import threading
+from collections.abc import Callable, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
 from pathlib import Path
+from typing import TextIO
 
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
 from sheep.observability.logging import get_logger
+from sheep.tools.git_tools import clear_status_cache
 
 _logger = get_logger(__name__)
 
+# Characters read per call while skipping lines before a requested range
+_READ_CHUNK = 64 * 1024
+
+# Connectors and indents for DirectoryTreeTool
+_TREE_BRANCH = "├── "
+_TREE_LAST = "└── "
+_TREE_PIPE = "│   "
+_TREE_SPACE = "    "
+
+# Entries shown per directory before the listing is cut off
+_TREE_MAX_ENTRIES = 50
+
+
+def _read_line_range(f: TextIO, start: int, end: int | None, limit: int) -> str:
+    """
+    Return lines start to end (0-indexed, end exclusive) of f.
+
+    Reading stops once more than ``limit`` characters were collected, and lines
+    are read in bounded pieces, so a huge file or line is never loaded whole.
+    """
+    parts: list[str] = []
+    size = 0
+    line_no = 0
+    while end is None or line_no < end:
+        if line_no < start:
+            piece = f.readline(_READ_CHUNK)
+        else:
+            piece = f.readline(limit + 1 - size)
+            parts.append(piece)
+            size += len(piece)
+        if not piece or size > limit:
+            break
+        if piece.endswith("\n"):
+            line_no += 1
+    return "".join(parts)
+
 
 class FileReadInput(BaseModel):
     """Input for reading a file."""
@@ -38,22 +81,25 @@ class FileReadTool(BaseTool):
         end_line: int | None = None,
     ) -> str:
         path = Path(file_path)
-        if not path.exists():
+        # One stat() answers both the existence and the file-type check
+        try:
+            mode = path.stat().st_mode
+        except (FileNotFoundError, NotADirectoryError):
             return f"Error: File does not exist: {file_path}"
+        except OSError as e:
+            return f"Error reading file: {e}"
 
-        if not path.is_file():
+        if not stat.S_ISREG(mode):
             return f"Error: Path is not a file: {file_path}"
 
         try:
-            with open(path, "r", encoding="utf-8", errors="replace") as f:
-                lines = f.readlines()
-
-            if start_line is not None or end_line is not None:
-                start = (start_line or 1) - 1
-                end = end_line or len(lines)
-                lines = lines[start:end]
-
-            content = "".join(lines)
+            with open(path, encoding="utf-8", errors="replace") as f:
+                if start_line is not None or end_line is not None:
+                    start = max((start_line or 1) - 1, 0)
+                    content = _read_line_range(f, start, end_line, 50000)
+                else:
+                    # Never load more than the output limit (plus one character to detect overflow)
+                    content = f.read(50000 + 1)
 
             # Limit output size
             if len(content) > 50000:
@@ -93,8 +139,14 @@ class FileWriteTool(BaseTool):
             if create_dirs and not path.parent.exists():
                 path.parent.mkdir(parents=True, exist_ok=True)
 
-            with open(path, "w", encoding="utf-8") as f:
-                f.write(content)
+            # Encode once and write the bytes in one call instead of going
+            # through a TextIOWrapper that encodes and buffers in chunks
+            data = content.encode("utf-8")
+            with open(path, "wb") as f:
+                f.write(data)
+
+            # The worktree changed, so a cached git status is stale now
+            clear_status_cache()
 
             return f"Successfully wrote {len(content)} characters to {file_path}"
         except Exception as e:
@@ -136,22 +188,47 @@ class FileSearchTool(BaseTool):
                 "rg",
                 "--line-number",
                 "--with-filename",
-                f"--max-count={max_results}",
                 f"--glob={file_pattern}",
-                pattern,
+                f"--regexp={pattern}",
                 str(path),
             ]
 
-            result = subprocess.run(
+            # --max-count is per file, so stream the output and stop at a
+            # global cap instead of buffering every match in memory.
+            proc = subprocess.Popen(
                 cmd,
-                capture_output=True,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
                 text=True,
-                timeout=30,
+                bufsize=1,
             )
+            timed_out = threading.Event()
 
-            if result.returncode == 0:
-                return result.stdout if result.stdout.strip() else "No matches found."
-            elif result.returncode == 1:
+            def _kill() -> None:
+                timed_out.set()
+                proc.kill()
+
+            timer = threading.Timer(30, _kill)
+            timer.start()
+            assert proc.stdout is not None
+            matches: list[str] = []
+            try:
+                for line in proc.stdout:
+                    matches.append(line)
+                    if len(matches) >= max_results:
+                        break
+            finally:
+                timer.cancel()
+                if proc.poll() is None:
+                    proc.terminate()
+                proc.wait(timeout=1)
+                proc.stdout.close()
+
+            if timed_out.is_set():
+                return "Error: Search timed out"
+            if matches:
+                return "".join(matches)
+            if proc.returncode in (0, 1):
                 return "No matches found."
             else:
                 # Fall back to grep
@@ -196,6 +273,21 @@ class FileSearchTool(BaseTool):
             return f"Error during grep fallback: {e}"
 
 
+def _list_dir(dir_path: str, show_hidden: bool) -> list[os.DirEntry[str]] | None:
+    """Return the sorted entries of dir_path, directories first, or None if unreadable."""
+    try:
+        # DirEntry caches the file type from the directory listing, so
+        # sorting and recursing don't cost a stat() per entry.
+        with os.scandir(dir_path) as it:
+            entries = [e for e in it if show_hidden or not e.name.startswith(".")]
+    except PermissionError:
+        return None
+
+    # Links to directories sort with the directories, as they're drawn like them
+    entries.sort(key=lambda e: (not e.is_dir(), e.name))
+    return entries
+
+
 class DirectoryTreeInput(BaseModel):
     """Input for directory tree."""
 
@@ -218,62 +310,88 @@ class DirectoryTreeTool(BaseTool):
         show_hidden: bool = False,
     ) -> str:
         path = Path(directory)
-        if not path.exists():
+        try:
+            mode = path.stat().st_mode
+        except (FileNotFoundError, NotADirectoryError):
             return f"Error: Directory does not exist: {directory}"
+        except OSError as e:
+            return f"Error: {e}"
 
-        lines: list[str] = []
-        self._build_tree(path, lines, "", max_depth, show_hidden)
+        lines = [str(path)]
+        if stat.S_ISDIR(mode) and max_depth > 0:
+            listings = self._list_levels(str(path), max_depth, show_hidden)
+            self._build_tree(str(path), listings, lines.append, "")
         return "\n".join(lines)
 
+    def _list_levels(
+        self, root: str, max_depth: int, show_hidden: bool
+    ) -> dict[str, list[os.DirEntry[str]] | None]:
+        """List every directory the tree will draw, one depth level at a time."""
+        listings: dict[str, list[os.DirEntry[str]] | None] = {}
+        level = [root]
+        listed: Iterable[list[os.DirEntry[str]] | None]
+        # scandir releases the GIL, so a level's directories can be read in parallel
+        with ThreadPoolExecutor() as pool:
+            for depth in range(1, max_depth + 1):
+                if len(level) == 1:
+                    listed = [_list_dir(level[0], show_hidden)]
+                else:
+                    listed = pool.map(_list_dir, level, repeat(show_hidden))
+                listings.update(zip(level, listed, strict=True))
+
+                # Children past max_depth would be dropped anyway, so don't list them
+                if depth == max_depth:
+                    break
+                level = [
+                    e.path
+                    for d in level
+                    for e in (listings[d] or ())[:_TREE_MAX_ENTRIES]
+                    if e.is_dir(follow_symlinks=False)
+                ]
+                if not level:
+                    break
+        return listings
+
     def _build_tree(
         self,
-        path: Path,
-        lines: list[str],
-        prefix: str,
-        max_depth: int,
-        show_hidden: bool,
-        depth: int = 0,
+        dir_path: str,
+        listings: dict[str, list[os.DirEntry[str]] | None],
+        append: Callable[[str], None],
+        indent: str,
     ) -> None:
-        """Recursively build tree representation."""
-        if depth > max_depth:
+        """Recursively append the listed entries of dir_path."""
+        entries = listings[dir_path]
+        if entries is None:
+            append(f"{indent}{_TREE_LAST}[permission denied]")
             return
 
-        if depth == 0:
-            lines.append(str(path))
-        else:
-            name = path.name
-            if path.is_dir():
-                name += "/"
-            lines.append(f"{prefix}{name}")
-
-        if path.is_dir() and depth < max_depth:
-            try:
-                entries = sorted(path.iterdir(), key=lambda x: (not x.is_dir(), x.name))
-                entries = [e for e in entries if show_hidden or not e.name.startswith(".")]
+        # Limit entries to prevent huge outputs
+        truncated = len(entries) > _TREE_MAX_ENTRIES
+        if truncated:
+            entries = entries[:_TREE_MAX_ENTRIES]
+
+        last = len(entries) - 1
+        for i, entry in enumerate(entries):
+            is_last = i == last and not truncated
+            line = indent + (_TREE_LAST if is_last else _TREE_BRANCH) + entry.name
+
+            if not entry.is_dir():
+                append(line)
+                continue
+            if entry.is_symlink():
+                # Show where the link points but don't follow it, which could loop
+                append(f"{line} -> {os.readlink(entry.path)}/")
+                continue
+
+            append(line + "/")
+            if entry.path in listings:
+                self._build_tree(
+                    entry.path,
+                    listings,
+                    append,
+                    indent + (_TREE_SPACE if is_last else _TREE_PIPE),
+                )
+
+        if truncated:
+            append(f"{indent}{_TREE_LAST}... (truncated)")
 
-                # Limit entries to prevent huge outputs
-                if len(entries) > 50:
-                    entries = entries[:50]
-                    truncated = True
-                else:
-                    truncated = False
-
-                for i, entry in enumerate(entries):
-                    is_last = i == len(entries) - 1 and not truncated
-                    connector = "└── " if is_last else "├── "
-                    new_prefix = prefix + ("    " if is_last else "│   ")
-
-                    self._build_tree(
-                        entry,
-                        lines,
-                        prefix + connector,
-                        max_depth,
-                        show_hidden,
-                        depth + 1,
-                    )
-
-                if truncated:
-                    lines.append(f"{prefix}└── ... (truncated)")
-
-            except PermissionError:
-                lines.append(f"{prefix}└── [permission denied]")
@@ -1,16 +1,30 @@
 """Git operations tools for agents."""
 
+import asyncio
+import json
+import os
 import subprocess
+import tempfile
+import time
+from collections.abc import Callable
+from functools import lru_cache, wraps
 from pathlib import Path
 from typing import Any
 
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
+from sheep.config.settings import get_settings
 from sheep.observability.logging import get_logger
 
 _logger = get_logger(__name__)
 
+# Diffs and logs beyond this many bytes are cut off; an agent can't use more
+_MAX_GIT_OUTPUT = 64 * 1024
+
+# Cached git status results are reused for at most this many seconds
+_STATUS_TTL = 2
+
 
 def _run_git(
     args: list[str],
@@ -24,34 +38,197 @@ def _run_git(
         cmd,
         cwd=cwd,
         capture_output=True,
-        text=True,
+        # git output is UTF-8 whatever the locale; never fail on stray bytes
+        encoding="utf-8",
+        errors="replace",
         check=check,
     )
 
 
+def _run_git_capped(args: list[str], cwd: Path, cap: int = _MAX_GIT_OUTPUT) -> str:
+    """
+    Run a read-only git command and return at most ``cap`` bytes of its output.
+
+    Raises CalledProcessError on failure, like _run_git with check=True.
+    """
+    cmd = ["git"] + args
+    _logger.debug("git_command", cmd=" ".join(cmd), cwd=str(cwd))
+    # stderr goes to a file: an undrained pipe would block git once it filled up
+    with (
+        tempfile.TemporaryFile() as err,
+        subprocess.Popen(cmd, cwd=cwd, stdout=subprocess.PIPE, stderr=err) as proc,
+    ):
+        assert proc.stdout is not None
+        data = proc.stdout.read(cap + 1)
+        # git stops at the closed pipe instead of producing the rest
+        proc.stdout.close()
+        proc.wait()
+        err.seek(0)
+        stderr = err.read()
+
+    truncated = len(data) > cap
+    if proc.returncode and not truncated:
+        raise subprocess.CalledProcessError(
+            proc.returncode,
+            cmd,
+            data.decode("utf-8", errors="replace"),
+            stderr.decode("utf-8", errors="replace"),
+        )
+
+    output = data[:cap].decode("utf-8", errors="replace")
+    if truncated:
+        output += "\n... (truncated)"
+    return output
+
+
+@lru_cache(maxsize=64)
+def _cached_status(
+    repo: str, args: tuple[str, ...], index_mtime: int, head_mtime: int, bucket: int
+) -> str:
+    """Run git status; the mtimes and time bucket only serve as the cache key."""
+    return _run_git(list(args), Path(repo)).stdout
+
+
+@lru_cache(maxsize=64)
+def _is_huge_repo(repo: str) -> bool:
+    """Whether the repo's index is over SHEEP_HUGE_INDEX_BYTES (checked once per repo)."""
+    try:
+        index_size = os.path.getsize(os.path.join(repo, ".git", "index"))
+    except OSError:
+        return False
+    return index_size > get_settings().git.huge_index_bytes
+
+
+@lru_cache(maxsize=64)
+def _tune_repo(repo: str) -> None:
+    """
+    Prepare a repo for fast status calls, once per process.
+
+    Enables git's untracked cache unless the repo already configures it.
+    """
+    if not get_settings().git.tune_repo:
+        return
+
+    path = Path(repo)
+    current = _run_git(["config", "--local", "--get", "core.untrackedCache"], path, check=False)
+    # Exit code 1 means the key is unset; never override an explicit choice
+    if current.returncode == 1:
+        _run_git(["config", "--local", "core.untrackedCache", "true"], path, check=False)
+
+
+def _git_status(path: Path, show_untracked: bool = True, huge: bool = False) -> str:
+    """Return ``git status --porcelain -b``, reusing recent results while the index is unchanged."""
+    # Read-only: don't take index.lock to refresh the index
+    args: tuple[str, ...] = (
+        "--no-optional-locks",
+        "status",
+        "--porcelain",
+        "-b",
+        "--untracked-files=normal" if show_untracked and not huge else "--untracked-files=no",
+    )
+    if huge:
+        args += ("--ignore-submodules=all",)
+
+    git_dir = path / ".git"
+    try:
+        index_mtime = os.stat(git_dir / "index").st_mtime_ns
+        head_mtime = os.stat(git_dir / "HEAD").st_mtime_ns
+    except OSError:
+        # Not a repo root, a linked worktree or a repo without an index yet
+        return _run_git(list(args), path).stdout
+
+    bucket = int(time.monotonic() // _STATUS_TTL)
+    return _cached_status(str(path.resolve()), args, index_mtime, head_mtime, bucket)
+
+
+def clear_status_cache() -> None:
+    """Forget cached git status results, e.g. after changing files or refs."""
+    _cached_status.cache_clear()
+
+
+def _fetch_branches(path: Path, *branches: str) -> None:
+    """Fetch just the given branches from the configured remote."""
+    args = ["fetch", "--no-tags"]
+    # Only keep the fetch shallow in an already-shallow clone; --depth in a
+    # full clone would turn it into a shallow one
+    if (path / ".git" / "shallow").exists():
+        args.append("--depth=1")
+    args.append(get_settings().git.remote)
+    args.extend(branches)
+    _run_git(args, path, check=False)
+
+
+def _check_repo(repo_path: str) -> str | None:
+    """Return an error message if repo_path doesn't exist."""
+    # A single access() check; unlike exists() no stat result is built
+    if not os.access(repo_path, os.F_OK):
+        return f"Error: Repository path does not exist: {repo_path}"
+    return None
+
+
+def _needs_repo(run: Callable[..., str]) -> Callable[..., str]:
+    """Decorate a tool's _run to return an error when its repo_path doesn't exist."""
+
+    @wraps(run)
+    def wrapper(self: BaseTool, repo_path: str, *args: Any, **kwargs: Any) -> str:
+        error = _check_repo(repo_path)
+        if error:
+            return error
+        try:
+            return run(self, repo_path, *args, **kwargs)
+        except FileNotFoundError:
+            # The repo, e.g. a worktree, was removed after the check
+            error = _check_repo(repo_path)
+            if error:
+                return error
+            raise
+
+    return wrapper
+
+
+class _GitTool(BaseTool):
+    """Base for git tools, adding async execution on top of the sync _run."""
+
+    async def _arun(self, *args: Any, **kwargs: Any) -> Any:
+        # git does its work in a child process, so running _run in a worker
+        # thread lets several git tools called from async code overlap
+        return await asyncio.to_thread(self._run, *args, **kwargs)
+
+
 class GitStatusInput(BaseModel):
     """Input for git status."""
 
     repo_path: str = Field(description="Path to the git repository")
+    show_untracked: bool = Field(
+        default=True,
+        description="List untracked files (slower on large repositories)",
+    )
 
 
-class GitStatusTool(BaseTool):
+class GitStatusTool(_GitTool):
     """Get the current git status of a repository."""
 
     name: str = "git_status"
     description: str = "Get the current git status showing modified, staged, and untracked files."
     args_schema: type[BaseModel] = GitStatusInput
 
-    def _run(self, repo_path: str) -> str:
+    @_needs_repo
+    def _run(self, repo_path: str, show_untracked: bool = True) -> str:
         path = Path(repo_path)
-        if not path.exists():
-            return f"Error: Repository path does not exist: {repo_path}"
 
         try:
-            result = _run_git(["status", "--porcelain", "-b"], path)
-            if not result.stdout.strip():
-                return "Working tree is clean, no changes."
-            return result.stdout
+            repo = str(path.resolve())
+            _tune_repo(repo)
+            huge = _is_huge_repo(repo)
+            output = _git_status(path, show_untracked, huge)
+            if not output.strip():
+                output = "Working tree is clean, no changes."
+            if huge:
+                output = (
+                    "Note: large repository, untracked files and submodules were not checked.\n"
+                    f"{output}"
+                )
+            return output
         except subprocess.CalledProcessError as e:
             return f"Git error: {e.stderr}"
 
@@ -66,13 +243,14 @@ class GitDiffInput(BaseModel):
     staged: bool = Field(default=False, description="Show staged changes only")
 
 
-class GitDiffTool(BaseTool):
+class GitDiffTool(_GitTool):
     """Show git diff of changes."""
 
     name: str = "git_diff"
     description: str = "Show the diff of changes in the repository."
     args_schema: type[BaseModel] = GitDiffInput
 
+    @_needs_repo
     def _run(
         self,
         repo_path: str,
@@ -80,21 +258,17 @@ class GitDiffTool(BaseTool):
         staged: bool = False,
     ) -> str:
         path = Path(repo_path)
-        if not path.exists():
-            return f"Error: Repository path does not exist: {repo_path}"
 
         try:
-            args = ["diff"]
+            args = ["--no-optional-locks", "diff"]
             if staged:
                 args.append("--staged")
             if file_path:
                 args.append("--")
                 args.append(file_path)
 
-            result = _run_git(args, path)
-            if not result.stdout.strip():
-                return "No changes to show."
-            return result.stdout
+            output = _run_git_capped(args, path)
+            return output if output.strip() else "No changes to show."
         except subprocess.CalledProcessError as e:
             return f"Git error: {e.stderr}"
 
@@ -105,35 +279,58 @@ class GitLogInput(BaseModel):
     repo_path: str = Field(description="Path to the git repository")
     count: int = Field(default=10, description="Number of commits to show")
     oneline: bool = Field(default=True, description="Use oneline format")
+    as_json: bool = Field(
+        default=False,
+        description="Return a JSON array of {sha, subject, author, time} objects instead",
+    )
 
 
-class GitLogTool(BaseTool):
+class GitLogTool(_GitTool):
     """Show git commit history."""
 
     name: str = "git_log"
     description: str = "Show recent commit history."
     args_schema: type[BaseModel] = GitLogInput
 
+    @_needs_repo
     def _run(
         self,
         repo_path: str,
         count: int = 10,
         oneline: bool = True,
+        as_json: bool = False,
     ) -> str:
         path = Path(repo_path)
-        if not path.exists():
-            return f"Error: Repository path does not exist: {repo_path}"
 
         try:
-            args = ["log", f"-{count}"]
+            if as_json:
+                return self._log_json(path, count)
+
+            args = ["--no-optional-locks", "log", f"-{count}"]
             if oneline:
                 args.append("--oneline")
 
-            result = _run_git(args, path)
-            return result.stdout if result.stdout.strip() else "No commits yet."
+            output = _run_git_capped(args, path)
+            return output if output.strip() else "No commits yet."
         except subprocess.CalledProcessError as e:
             return f"Git error: {e.stderr}"
 
+    def _log_json(self, path: Path, count: int) -> str:
+        """Return recent commits as JSON, parsed from NUL/unit-separator delimited output."""
+        result = _run_git(
+            ["--no-optional-locks", "log", f"-{count}", "-z", "--format=%H%x1f%s%x1f%an%x1f%ct"],
+            path,
+        )
+        commits = []
+        for record in result.stdout.split("\0"):
+            if not record:
+                continue
+            sha, subject, author, timestamp = record.split("\x1f", 3)
+            commits.append(
+                {"sha": sha, "subject": subject, "author": author, "time": int(timestamp)}
+            )
+        return json.dumps(commits)
+
 
 class GitCreateBranchInput(BaseModel):
     """Input for creating a git branch."""
@@ -143,34 +340,38 @@ class GitCreateBranchInput(BaseModel):
     base_branch: str | None = Field(
         default=None, description="Base branch to create from (default: current branch)"
     )
+    do_fetch: bool = Field(
+        default=False, description="Fetch the base branch from the remote first"
+    )
 
 
-class GitCreateBranchTool(BaseTool):
+class GitCreateBranchTool(_GitTool):
     """Create a new git branch."""
 
     name: str = "git_create_branch"
     description: str = "Create a new git branch from the current or specified base branch."
     args_schema: type[BaseModel] = GitCreateBranchInput
 
+    @_needs_repo
     def _run(
         self,
         repo_path: str,
         branch_name: str,
         base_branch: str | None = None,
+        do_fetch: bool = False,
     ) -> str:
         path = Path(repo_path)
-        if not path.exists():
-            return f"Error: Repository path does not exist: {repo_path}"
 
         try:
-            # Fetch latest if there's a remote
-            _run_git(["fetch", "--all"], path, check=False)
+            if do_fetch:
+                _fetch_branches(path, base_branch or "HEAD")
 
             args = ["checkout", "-b", branch_name]
             if base_branch:
                 args.append(base_branch)
 
             result = _run_git(args, path)
+            clear_status_cache()
             return f"Created and switched to branch: {branch_name}"
         except subprocess.CalledProcessError as e:
             return f"Git error: {e.stderr}"
@@ -183,20 +384,20 @@ class GitCheckoutInput(BaseModel):
     branch_name: str = Field(description="Name of the branch to checkout")
 
 
-class GitCheckoutTool(BaseTool):
+class GitCheckoutTool(_GitTool):
     """Checkout a git branch."""
 
     name: str = "git_checkout"
     description: str = "Switch to an existing git branch."
     args_schema: type[BaseModel] = GitCheckoutInput
 
+    @_needs_repo
     def _run(self, repo_path: str, branch_name: str) -> str:
         path = Path(repo_path)
-        if not path.exists():
-            return f"Error: Repository path does not exist: {repo_path}"
 
         try:
             result = _run_git(["checkout", branch_name], path)
+            clear_status_cache()
             return f"Switched to branch: {branch_name}"
         except subprocess.CalledProcessError as e:
             return f"Git error: {e.stderr}"
@@ -210,13 +411,14 @@ class GitCommitInput(BaseModel):
     add_all: bool = Field(default=True, description="Stage all changes before commit")
 
 
-class GitCommitTool(BaseTool):
+class GitCommitTool(_GitTool):
     """Create a git commit."""
 
     name: str = "git_commit"
     description: str = "Stage changes and create a git commit."
     args_schema: type[BaseModel] = GitCommitInput
 
+    @_needs_repo
     def _run(
         self,
         repo_path: str,
@@ -224,17 +426,17 @@ class GitCommitTool(BaseTool):
         add_all: bool = True,
     ) -> str:
         path = Path(repo_path)
-        if not path.exists():
-            return f"Error: Repository path does not exist: {repo_path}"
 
         try:
             if add_all:
                 _run_git(["add", "-A"], path)
 
             result = _run_git(["commit", "-m", message], path)
+            clear_status_cache()
             return f"Committed: {message}\n{result.stdout}"
         except subprocess.CalledProcessError as e:
-            if "nothing to commit" in e.stderr.lower():
+            # git reports an empty commit on stdout, not stderr
+            if "nothing to commit" in f"{e.stdout}{e.stderr}".lower():
                 return "Nothing to commit, working tree clean."
             return f"Git error: {e.stderr}"
 
@@ -252,13 +454,14 @@ class GitPushInput(BaseModel):
     )
 
 
-class GitPushTool(BaseTool):
+class GitPushTool(_GitTool):
     """Push changes to remote repository."""
 
     name: str = "git_push"
     description: str = "Push committed changes to the remote repository."
     args_schema: type[BaseModel] = GitPushInput
 
+    @_needs_repo
     def _run(
         self,
         repo_path: str,
@@ -267,13 +470,13 @@ class GitPushTool(BaseTool):
         set_upstream: bool = True,
     ) -> str:
         path = Path(repo_path)
-        if not path.exists():
-            return f"Error: Repository path does not exist: {repo_path}"
 
         try:
             # Get current branch if not specified
             if branch is None:
-                result = _run_git(["rev-parse", "--abbrev-ref", "HEAD"], path)
+                result = _run_git(
+                    ["--no-optional-locks", "rev-parse", "--abbrev-ref", "HEAD"], path
+                )
                 branch = result.stdout.strip()
 
             args = ["push"]
@@ -297,9 +500,12 @@ class GitWorktreeInput(BaseModel):
     base_branch: str = Field(
         default="main", description="Base branch to create worktree from"
     )
+    do_fetch: bool = Field(
+        default=False, description="Fetch the base branch from the remote first"
+    )
 
 
-class GitWorktreeTool(BaseTool):
+class GitWorktreeTool(_GitTool):
     """Manage git worktrees for isolated development."""
 
     name: str = "git_worktree"
@@ -309,28 +515,78 @@ class GitWorktreeTool(BaseTool):
     )
     args_schema: type[BaseModel] = GitWorktreeInput
 
+    @_needs_repo
     def _run(
         self,
         repo_path: str,
         worktree_path: str,
         branch_name: str,
         base_branch: str = "main",
+        do_fetch: bool = False,
     ) -> str:
         path = Path(repo_path)
-        worktree = Path(worktree_path)
 
-        if not path.exists():
-            return f"Error: Repository path does not exist: {repo_path}"
+        if Path(worktree_path).exists():
+            return f"Error: Worktree path already exists: {worktree_path}"
+
+        if do_fetch:
+            _fetch_branches(path, base_branch)
+        return self._add_worktree(path, worktree_path, branch_name, base_branch)
+
+    async def create_many(
+        self, repo_path: str, specs: list[dict[str, str]], do_fetch: bool = False
+    ) -> list[str]:
+        """
+        Create several worktrees concurrently, fetching their base branches at most once.
+
+        Args:
+            repo_path: Path to the main git repository.
+            specs: One dict per worktree with ``worktree_path``, ``branch_name``
+                and optionally ``base_branch`` keys.
+            do_fetch: Fetch the base branches from the remote first.
+
+        Returns:
+            The result message for each spec, in order.
+        """
+        error = _check_repo(repo_path)
+        if error:
+            return [error] * len(specs)
+
+        path = Path(repo_path)
 
+        if do_fetch:
+            bases = dict.fromkeys(spec.get("base_branch", "main") for spec in specs)
+            await asyncio.to_thread(_fetch_branches, path, *bases)
+        return list(
+            await asyncio.gather(
+                *(
+                    asyncio.to_thread(
+                        self._add_worktree,
+                        path,
+                        spec["worktree_path"],
+                        spec["branch_name"],
+                        spec.get("base_branch", "main"),
+                    )
+                    for spec in specs
+                )
+            )
+        )
+
+    def _add_worktree(
+        self,
+        path: Path,
+        worktree_path: str,
+        branch_name: str,
+        base_branch: str,
+    ) -> str:
+        """Create one worktree with a new branch, without fetching."""
+        worktree = Path(worktree_path)
         if worktree.exists():
             return f"Error: Worktree path already exists: {worktree_path}"
 
         try:
-            # Fetch latest
-            _run_git(["fetch", "--all"], path, check=False)
-
             # Create worktree with new branch
-            result = _run_git(
+            _run_git(
                 ["worktree", "add", "-b", branch_name, str(worktree), base_branch],
                 path,
             )
@@ -1,18 +1,164 @@
 """Web operation tools for agents."""
 
+import asyncio
+import atexit
+import hashlib
+import json
+import os
+import re
+import subprocess
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from importlib.util import find_spec
+from pathlib import Path
+from typing import IO, TYPE_CHECKING, Any
+
 import httpx
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 
 from sheep.observability.logging import get_logger
+from sheep.tools.git_tools import clear_status_cache
+
+if TYPE_CHECKING:
+    import duckduckgo_search
+
+# Optional at runtime; web_search reports a missing package instead of failing to import
+DDGS: "type[duckduckgo_search.DDGS] | None"
+try:
+    from duckduckgo_search import DDGS
+except ImportError:
+    DDGS = None
 
 _logger = get_logger(__name__)
 
+# Upper bound on concurrent requests for a multi-URL web_fetch
+_MAX_PARALLEL_FETCHES = 8
+
+# Upper bound on concurrent searches in WebSearchTool.search_many
+_MAX_PARALLEL_SEARCHES = 4
+
+# Only the last this many bytes of a shell command's stdout/stderr are returned
+_MAX_SHELL_OUTPUT = 64 * 1024
+
+
+# Fetched pages are kept here with their ETag/Last-Modified for conditional requests
+_CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "sheep" / "webfetch"
+
+# Cache entries past this many, or older than this many seconds, are pruned
+_CACHE_MAX_ENTRIES = 256
+_CACHE_MAX_AGE = 7 * 24 * 3600
+
+# Cache-Control directives that forbid keeping a response on disk
+_UNCACHEABLE_DIRECTIVES = {"no-store", "private"}
+
+# URLs whose query looks like it carries credentials are never cached
+_SECRET_QUERY_RE = re.compile(r"[?&][^=]*(token|key|sig|auth|secret|password)[^=]*=", re.I)
+
+
+def _cache_path(url: str) -> Path:
+    """Return the cache file path for a URL."""
+    key = hashlib.blake2b(url.encode(), digest_size=16).hexdigest()
+    return _CACHE_DIR / f"{key}.cache"
+
+
+def _load_cached(url: str) -> tuple[dict[str, str], bytes] | None:
+    """Return the cached metadata and body for a URL, if any."""
+    try:
+        # One line of JSON metadata, then the body
+        header, _, body = _cache_path(url).read_bytes().partition(b"\n")
+        meta = json.loads(header)
+    except (OSError, ValueError):
+        return None
+    if meta.get("url") != url:
+        return None
+    return meta, body
+
+
+def _store_cached(url: str, response: httpx.Response, body: bytes, encoding: str) -> None:
+    """Cache a response body if it may be stored and has a validator to revalidate it with."""
+    cache_control = response.headers.get("cache-control", "")
+    directives = {d.split("=", 1)[0].strip().lower() for d in cache_control.split(",")}
+    if directives & _UNCACHEABLE_DIRECTIVES:
+        return
+
+    etag = response.headers.get("etag")
+    last_modified = response.headers.get("last-modified")
+    if not etag and not last_modified:
+        return
+
+    meta = {"url": url, "encoding": encoding}
+    if etag:
+        meta["etag"] = etag
+    if last_modified:
+        meta["last_modified"] = last_modified
+    try:
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        # Write a temp file and rename it into place so readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=_CACHE_DIR, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(json.dumps(meta).encode() + b"\n")
+                f.write(body)
+            os.replace(tmp, _cache_path(url))
+        except OSError:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        _prune_cache()
+    except OSError as e:
+        _logger.debug("web_cache_write_failed", url=url, error=str(e))
+
+
+def _prune_cache() -> None:
+    """Delete cache files past the age limit, then the oldest past the count limit."""
+    cutoff = time.time() - _CACHE_MAX_AGE
+    kept: list[tuple[float, str]] = []
+    with os.scandir(_CACHE_DIR) as it:
+        for entry in it:
+            try:
+                mtime = entry.stat().st_mtime
+            except OSError:
+                continue  # Removed by a concurrent prune
+            if mtime < cutoff:
+                Path(entry.path).unlink(missing_ok=True)
+            else:
+                kept.append((mtime, entry.path))
+
+    kept.sort(reverse=True)
+    for _, path in kept[_CACHE_MAX_ENTRIES:]:
+        Path(path).unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=1)
+def _http_client() -> httpx.Client:
+    """
+    Return the HTTP client shared by all web fetches.
+
+    Keeping one pooled client lets repeated fetches to the same host reuse
+    open connections instead of redoing the TCP and TLS handshakes. HTTP/2 is
+    used when the optional h2 package is installed.
+    """
+    client = httpx.Client(
+        timeout=30.0,
+        follow_redirects=True,
+        http2=find_spec("h2") is not None,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+    )
+    atexit.register(client.close)
+    return client
+
 
 class WebFetchInput(BaseModel):
     """Input for fetching web content."""
 
     url: str = Field(description="URL to fetch content from")
+    extra_urls: list[str] = Field(
+        default_factory=list,
+        description="Additional URLs to fetch in parallel with `url`",
+    )
 
 
 class WebFetchTool(BaseTool):
@@ -21,23 +167,65 @@ class WebFetchTool(BaseTool):
     name: str = "web_fetch"
     description: str = (
         "Fetch content from a web URL. Returns the HTML content of the page. "
-        "Use this to retrieve documentation, articles, or any web content."
+        "Use this to retrieve documentation, articles, or any web content. "
+        "To read several pages, pass the rest in extra_urls to fetch them in parallel."
     )
     args_schema: type[BaseModel] = WebFetchInput
 
-    def _run(self, url: str) -> str:
-        try:
-            # Add timeout and follow redirects
-            with httpx.Client(timeout=30.0, follow_redirects=True) as client:
-                response = client.get(url)
-                response.raise_for_status()
+    def _run(self, url: str, extra_urls: list[str] | None = None) -> str:
+        urls = [url, *(extra_urls or [])]
+        client = _http_client()
+        if len(urls) == 1:
+            return self._fetch(client, url)
 
-                # Limit output size to avoid overwhelming the agent
-                content = response.text
-                if len(content) > 100000:
-                    content = content[:100000] + "\n... (content truncated)"
+        # Fetches are network-bound, so threads overlap the waits
+        workers = min(len(urls), _MAX_PARALLEL_FETCHES)
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            results = pool.map(lambda u: self._fetch(client, u), urls)
+            return "\n\n---\n\n".join(results)
 
-                return f"Successfully fetched content from {url}\n\nContent:\n{content}"
+    async def _arun(self, *args: Any, **kwargs: Any) -> Any:
+        # The pooled client is synchronous and thread-safe, so run it off the event loop
+        return await asyncio.to_thread(self._run, *args, **kwargs)
+
+    def _fetch(self, client: httpx.Client, url: str) -> str:
+        """Fetch a single URL and format the result for the agent."""
+        try:
+            cacheable = not _SECRET_QUERY_RE.search(url)
+            cached = _load_cached(url) if cacheable else None
+            headers = {}
+            if cached:
+                meta = cached[0]
+                if "etag" in meta:
+                    headers["If-None-Match"] = meta["etag"]
+                if "last_modified" in meta:
+                    headers["If-Modified-Since"] = meta["last_modified"]
+
+            # Stream the body and stop reading once past the output limit
+            with client.stream("GET", url, headers=headers) as response:
+                if cached and response.status_code == 304:
+                    # Unchanged since we cached it; no body was sent
+                    meta, body = cached
+                    encoding = meta["encoding"]
+                else:
+                    response.raise_for_status()
+                    buf = bytearray()
+                    for chunk in response.iter_bytes():
+                        buf += chunk
+                        if len(buf) > 100000:
+                            break
+                    # One byte past the limit is kept so truncation can be detected
+                    body = bytes(buf[:100001])
+                    encoding = response.encoding or "utf-8"
+                    if cacheable:
+                        _store_cached(url, response, body, encoding)
+
+            # Limit output size to avoid overwhelming the agent
+            content = body[:100000].decode(encoding, errors="replace")
+            if len(body) > 100000:
+                content += "\n... (content truncated)"
+
+            return f"Successfully fetched content from {url}\n\nContent:\n{content}"
 
         except httpx.HTTPStatusError as e:
             return f"HTTP error occurred: {e.response.status_code} - {e}"
@@ -59,6 +247,23 @@ class WebSearchInput(BaseModel):
     )
 
 
+_ddgs_local = threading.local()
+
+
+def _ddgs() -> "duckduckgo_search.DDGS":
+    """
+    Return this thread's DuckDuckGo client.
+
+    Reusing it keeps the connection and cookies between searches; clients
+    are per thread so concurrent searches don't share one.
+    """
+    ddgs = getattr(_ddgs_local, "client", None)
+    if ddgs is None:
+        assert DDGS is not None  # WebSearchTool checks before searching
+        ddgs = _ddgs_local.client = DDGS(timeout=20)
+    return ddgs
+
+
 class WebSearchTool(BaseTool):
     """Search the web using DuckDuckGo."""
 
@@ -73,34 +278,32 @@ class WebSearchTool(BaseTool):
     args_schema: type[BaseModel] = WebSearchInput
 
     def _run(self, query: str, max_results: int = 5) -> str:
-        try:
-            from duckduckgo_search import DDGS
-            import time
+        if DDGS is None:
+            return (
+                "Error: duckduckgo-search package not installed. "
+                "Install with: pip install duckduckgo-search"
+            )
 
+        try:
             results = []
 
             # Retry logic for rate limiting
             max_retries = 3
             for attempt in range(max_retries):
                 try:
-                    # Try with increased timeout and proxy settings
-                    with DDGS(timeout=20, proxies=None) as ddgs:
-                        # Use the text search
-                        search_results = list(ddgs.text(
-                            query,
-                            max_results=max_results,
-                        ))
-
-                        for i, result in enumerate(search_results, 1):
-                            title = result.get("title", "No title")
-                            url = result.get("href", "No URL")
-                            snippet = result.get("body", "No description")
-
-                            results.append(
-                                f"{i}. **{title}**\n"
-                                f"   URL: {url}\n"
-                                f"   {snippet}\n"
-                            )
+                    # Use the text search
+                    search_results = _ddgs().text(query, max_results=max_results)
+
+                    for i, result in enumerate(search_results, 1):
+                        title = result.get("title", "No title")
+                        url = result.get("href", "No URL")
+                        snippet = result.get("body", "No description")
+
+                        results.append(
+                            f"{i}. **{title}**\n"
+                            f"   URL: {url}\n"
+                            f"   {snippet}\n"
+                        )
 
                     # If we got results, break out of retry loop
                     if results:
@@ -141,11 +344,6 @@ class WebSearchTool(BaseTool):
                 + "\n".join(results)
             )
 
-        except ImportError:
-            return (
-                "Error: duckduckgo-search package not installed. "
-                "Install with: pip install duckduckgo-search"
-            )
         except Exception as e:
             return (
                 f"Error performing web search: {e}\n\n"
@@ -153,6 +351,40 @@ class WebSearchTool(BaseTool):
                 f"for example: web_fetch('https://docs.python.org/3/library/asyncio.html')"
             )
 
+    async def _arun(self, *args: Any, **kwargs: Any) -> str:
+        # DDGS is synchronous (and retries sleep), so run it off the event loop
+        return await asyncio.to_thread(self._run, *args, **kwargs)
+
+    async def search_many(self, queries: list[str], max_results: int = 5) -> list[str]:
+        """
+        Run several searches concurrently.
+
+        Args:
+            queries: Search queries.
+            max_results: Maximum number of results per query.
+
+        Returns:
+            The formatted results for each query, in order.
+        """
+        # Keep a few searches in flight at once to stay clear of rate limits
+        semaphore = asyncio.Semaphore(_MAX_PARALLEL_SEARCHES)
+
+        async def search(query: str) -> str:
+            async with semaphore:
+                return await self._arun(query, max_results)
+
+        return list(await asyncio.gather(*(search(q) for q in queries)))
+
+
+def _read_tail(f: IO[bytes], limit: int = _MAX_SHELL_OUTPUT) -> str:
+    """Decode the last ``limit`` bytes written to a temp file."""
+    size = os.fstat(f.fileno()).st_size
+    f.seek(max(0, size - limit))
+    tail = f.read().decode("utf-8", errors="replace")
+    if size > limit:
+        return f"... (output truncated, showing last {limit // 1024} KiB)\n{tail}"
+    return tail
+
 
 class ShellCommandInput(BaseModel):
     """Input for running shell commands."""
@@ -176,9 +408,6 @@ class ShellCommandTool(BaseTool):
     args_schema: type[BaseModel] = ShellCommandInput
 
     def _run(self, command: str, working_dir: str | None = None) -> str:
-        import subprocess
-        from pathlib import Path
-
         try:
             # Validate working directory
             cwd = None
@@ -187,21 +416,28 @@ class ShellCommandTool(BaseTool):
                 if not cwd.exists():
                     return f"Error: Working directory does not exist: {working_dir}"
 
-            # Execute command with timeout
-            result = subprocess.run(
-                command,
-                shell=True,
-                capture_output=True,
-                text=True,
-                timeout=300,  # 5 minute timeout
-                cwd=cwd,
-            )
+            # Execute command with timeout. Output goes to temp files rather than
+            # memory, and only its tail (where errors and summaries are) is kept
+            with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+                result = subprocess.run(
+                    command,
+                    shell=True,
+                    stdout=out,
+                    stderr=err,
+                    timeout=300,  # 5 minute timeout
+                    cwd=cwd,
+                )
+                stdout = _read_tail(out)
+                stderr = _read_tail(err)
+
+            # The command may have changed files, so a cached git status is stale now
+            clear_status_cache()
 
             output = []
-            if result.stdout:
-                output.append(f"STDOUT:\n{result.stdout}")
-            if result.stderr:
-                output.append(f"STDERR:\n{result.stderr}")
+            if stdout:
+                output.append(f"STDOUT:\n{stdout}")
+            if stderr:
+                output.append(f"STDERR:\n{stderr}")
 
             output.append(f"\nReturn code: {result.returncode}")
 
@@ -0,0 +1,37 @@
+"""Shared test fixtures."""
+
+import os
+
+import pytest
+
+from sheep.config.settings import get_settings
+from sheep.tools import git_tools
+
+# Environment variables that feed Settings; a developer's shell must not leak into tests
+_SETTINGS_ENV_PREFIXES = ("SHEEP_", "LANGFUSE_")
+_PROVIDER_ENV_VARS = (
+    "OPENAI_API_KEY",
+    "ANTHROPIC_API_KEY",
+    "GOOGLE_API_KEY",
+    "CURSOR_API_KEY",
+    "CURSOR_API_BASE",
+)
+
+
+@pytest.fixture(autouse=True)
+def _isolated_env(monkeypatch, tmp_path):
+    """Run each test without any sheep, Langfuse or provider settings from the environment."""
+    for name in list(os.environ):
+        if name.startswith(_SETTINGS_ENV_PREFIXES) or name in _PROVIDER_ENV_VARS:
+            monkeypatch.delenv(name)
+    # Settings read .env from the working directory; a developer's own file must not apply
+    monkeypatch.chdir(tmp_path)
+
+
+@pytest.fixture(autouse=True)
+def _fresh_caches(_isolated_env):
+    """Give each test fresh settings and no git results cached by another test."""
+    get_settings.cache_clear()
+    git_tools.clear_status_cache()
+    yield
+    get_settings.cache_clear()
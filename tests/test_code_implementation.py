@@ -0,0 +1,65 @@
+"""Tests for the code implementation flow helpers."""
+
+import subprocess
+
+import pytest
+
+from sheep.flows.code_implementation import _is_low_risk_path, _low_risk_change_size
+
+
+def _init_repo(path):
+    """Create a repo with one committed source file and one committed doc."""
+    identity = ["-c", "user.name=Sheep", "-c", "user.email=sheep@example.com"]
+    subprocess.run(["git", "init", "-q", str(path)], check=True)
+    (path / "app.py").write_text("x = 1\n")
+    (path / "README.md").write_text("# App\n")
+    subprocess.run(["git", "add", "."], cwd=path, check=True)
+    subprocess.run(["git", *identity, "commit", "-q", "-m", "init"], cwd=path, check=True)
+
+
+@pytest.mark.parametrize(
+    "path",
+    ["README.md", "README", "docs/guide.rst", "tests/test_app.py", "pkg/notes.md"],
+)
+def test_low_risk_paths(path):
+    """Test that docs and tests count as low-risk."""
+    assert _is_low_risk_path(path)
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "requirements.txt",
+        "requirements-dev.txt",
+        "docs/requirements.txt",
+        "CMakeLists.txt",
+        "README_generator.py",
+        "app.py",
+    ],
+)
+def test_risky_paths(path):
+    """Test that dependency pins, build files and look-alike names are reviewed."""
+    assert not _is_low_risk_path(path)
+
+
+def test_low_risk_change_size_counts_doc_lines(tmp_path):
+    """Test that a small docs-only change reports its size."""
+    _init_repo(tmp_path)
+    (tmp_path / "README.md").write_text("# App\n\nUsage.\n")
+
+    assert _low_risk_change_size(str(tmp_path)) == 2
+
+
+def test_low_risk_change_size_without_changes(tmp_path):
+    """Test that an empty diff doesn't qualify for skipping review."""
+    _init_repo(tmp_path)
+
+    assert _low_risk_change_size(str(tmp_path)) is None
+
+
+def test_low_risk_change_size_with_requirements(tmp_path):
+    """Test that a new dependency pin doesn't qualify for skipping review."""
+    _init_repo(tmp_path)
+    (tmp_path / "requirements.txt").write_text("requests==2.32.0\n")
+
+    assert _low_risk_change_size(str(tmp_path)) is None
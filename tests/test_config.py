@@ -1,47 +1,64 @@
 """Tests for configuration module."""
 
-import os
-from unittest.mock import patch
-
 import pytest
 
+from sheep.config.settings import (
+    LangfuseSettings,
+    LLMSettings,
+    get_settings,
+    provider_for_model,
+)
+
 
-def test_settings_defaults():
+def test_settings_defaults(monkeypatch):
     """Test that settings have sensible defaults."""
     # Clear any existing environment variables that might affect the test
-    env_vars_to_clear = [
+    for var in (
         "SHEEP_DEFAULT_MODEL",
         "SHEEP_FAST_MODEL",
         "SHEEP_REASONING_MODEL",
         "SHEEP_LOG_LEVEL",
-    ]
+    ):
+        monkeypatch.delenv(var, raising=False)
+
+    settings = get_settings()
+
+    assert settings.default_model == "openai/gpt-4o"
+    assert settings.fast_model == "openai/gpt-4o-mini"
+    assert settings.log_level == "INFO"
+    assert settings.max_iterations == 25
+
 
-    with patch.dict(os.environ, {k: "" for k in env_vars_to_clear}, clear=False):
-        # Need to clear the lru_cache to get fresh settings
-        from sheep.config.settings import get_settings
+def test_settings_ignore_unprefixed_env_vars(monkeypatch):
+    """Test that generic variables named like a field don't leak into settings."""
+    monkeypatch.setenv("LOG_LEVEL", "DEBUG")
+    monkeypatch.setenv("FAST_MODEL", "x/y")
+    monkeypatch.setenv("REMOTE", "upstream")
+    monkeypatch.setenv("HOST", "http://evil")
 
-        get_settings.cache_clear()
-        settings = get_settings()
+    settings = get_settings()
 
-        assert settings.default_model == "openai/gpt-4o"
-        assert settings.fast_model == "openai/gpt-4o-mini"
-        assert settings.log_level == "INFO"
-        assert settings.max_iterations == 25
+    assert settings.log_level == "INFO"
+    assert settings.fast_model == "openai/gpt-4o-mini"
+    assert settings.git.remote == "origin"
+    assert settings.langfuse.host == "https://cloud.langfuse.com"
 
 
 def test_llm_settings_providers():
     """Test that LLM settings correctly identify available providers."""
-    from sheep.config.settings import LLMSettings
-
     # No providers configured
     settings = LLMSettings()
     assert settings.get_available_providers() == []
+    assert settings.available_providers == frozenset()
+
+    # Configured providers are reported in display order
+    settings = LLMSettings(GOOGLE_API_KEY="g-test", OPENAI_API_KEY="sk-test")  # type: ignore
+    assert settings.available_providers == {"openai", "google"}
+    assert settings.get_available_providers() == ["openai", "google"]
 
 
 def test_langfuse_settings_configured():
     """Test Langfuse configuration detection."""
-    from sheep.config.settings import LangfuseSettings
-
     # Not configured
     settings = LangfuseSettings()
     assert not settings.is_configured
@@ -49,3 +66,10 @@ def test_langfuse_settings_configured():
     # Partially configured
     settings = LangfuseSettings(public_key="pk-test")  # type: ignore
     assert not settings.is_configured
+
+
+def test_provider_for_model():
+    """Test provider resolution from model identifiers."""
+    assert provider_for_model("anthropic/claude-3-5-sonnet-20241022") == "anthropic"
+    assert provider_for_model("gemini/gemini-2.5-flash") == "google"
+    assert provider_for_model("gpt-4o") == "openai"
@@ -0,0 +1,32 @@
+"""Tests for the Langfuse integration."""
+
+import os
+import threading
+
+from sheep.observability import langfuse_client
+
+
+def test_background_init_sets_env_on_calling_thread(monkeypatch):
+    """Test that the environment is exported before the init thread starts."""
+    monkeypatch.setenv("LANGFUSE_PUBLIC_KEY", "pk-test")
+    monkeypatch.setenv("LANGFUSE_SECRET_KEY", "sk-test")
+    monkeypatch.setenv("LANGFUSE_BASE_URL", "https://langfuse.example.com")
+    monkeypatch.setattr(langfuse_client, "_init_thread", None)
+    monkeypatch.setattr(langfuse_client, "_instrumented", False)
+    calls = []
+    set_env = langfuse_client._set_env
+
+    def record_set_env(values):
+        calls.append(threading.current_thread())
+        set_env(values)
+
+    def connect(settings):
+        calls.append(os.environ["LANGFUSE_BASE_URL"])
+
+    monkeypatch.setattr(langfuse_client, "_set_env", record_set_env)
+    monkeypatch.setattr(langfuse_client, "_connect", connect)
+
+    langfuse_client.init_observability_in_background()
+    langfuse_client.wait_for_observability()
+
+    assert calls == [threading.main_thread(), "https://langfuse.example.com"]
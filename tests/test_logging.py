@@ -0,0 +1,23 @@
+"""Tests for observability logging."""
+
+import io
+from types import SimpleNamespace
+
+from rich.console import Console
+
+from sheep.observability import logging as sheep_logging
+
+
+def test_agent_logger_prints_markup_like_text(monkeypatch):
+    """Test that LLM text with Rich markup syntax is printed literally."""
+    console = Console(file=io.StringIO(), width=200)
+    monkeypatch.setattr(sheep_logging, "_console", console)
+    logger = sheep_logging.AgentLogger("implementer")
+    logger._rich = True  # The captured console isn't a terminal
+
+    logger.step(SimpleNamespace(thought="Replace foo[/bar] with [bold]baz"))
+    logger.error("bad token [/]")
+
+    output = console.file.getvalue()
+    assert "Replace foo[/bar] with [bold]baz" in output
+    assert "bad token [/]" in output
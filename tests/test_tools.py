@@ -1,11 +1,25 @@
 """Tests for tools."""
 
-import tempfile
+import asyncio
+import json
+import os
+import shutil
+import subprocess
+import time
 from pathlib import Path
 
+import httpx
 import pytest
 
-from sheep.tools.file_tools import DirectoryTreeTool, FileReadTool, FileWriteTool
+from sheep.tools import git_tools, web_tools
+from sheep.tools.file_tools import (
+    DirectoryTreeTool,
+    FileReadTool,
+    FileSearchTool,
+    FileWriteTool,
+)
+from sheep.tools.git_tools import GitLogTool, GitStatusTool, GitWorktreeTool
+from sheep.tools.web_tools import WebSearchTool
 
 
 class TestFileTools:
@@ -18,53 +32,292 @@ class TestFileTools:
         assert "Error" in result
         assert "does not exist" in result
 
-    def test_file_write_and_read(self):
+    def test_file_write_and_read(self, tmp_path):
         """Test writing and reading a file."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = f"{tmpdir}/test.txt"
-            content = "Hello, Sheep!"
+        tmpdir = str(tmp_path)
+        filepath = f"{tmpdir}/test.txt"
+        content = "Hello, Sheep!"
 
-            # Write
-            write_tool = FileWriteTool()
-            result = write_tool._run(filepath, content)
-            assert "Successfully wrote" in result
+        # Write
+        write_tool = FileWriteTool()
+        result = write_tool._run(filepath, content)
+        assert "Successfully wrote" in result
 
-            # Read
-            read_tool = FileReadTool()
-            result = read_tool._run(filepath)
-            assert result == content
+        # Read
+        read_tool = FileReadTool()
+        result = read_tool._run(filepath)
+        assert result == content
 
-    def test_file_read_with_line_range(self):
+    def test_file_read_counts_characters_and_normalizes_newlines(self, tmp_path):
+        """Test that the size cap counts characters and CRLF line endings read as LF."""
+        filepath = tmp_path / "text.txt"
+        filepath.write_bytes("é\r\n".encode() * 20000)
+
+        result = FileReadTool()._run(str(filepath))
+
+        assert result == "é\n" * 20000
+
+    def test_file_read_with_line_range(self, tmp_path):
         """Test reading specific lines from a file."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            filepath = f"{tmpdir}/test.txt"
-            content = "line1\nline2\nline3\nline4\nline5"
-
-            # Write
-            write_tool = FileWriteTool()
-            write_tool._run(filepath, content)
-
-            # Read lines 2-4
-            read_tool = FileReadTool()
-            result = read_tool._run(filepath, start_line=2, end_line=4)
-            assert "line2" in result
-            assert "line3" in result
-            assert "line4" in result
-            assert "line1" not in result
-            assert "line5" not in result
-
-    def test_directory_tree(self):
+        tmpdir = str(tmp_path)
+        filepath = f"{tmpdir}/test.txt"
+        content = "line1\nline2\nline3\nline4\nline5"
+
+        # Write
+        write_tool = FileWriteTool()
+        write_tool._run(filepath, content)
+
+        # Read lines 2-4
+        read_tool = FileReadTool()
+        result = read_tool._run(filepath, start_line=2, end_line=4)
+        assert "line2" in result
+        assert "line3" in result
+        assert "line4" in result
+        assert "line1" not in result
+        assert "line5" not in result
+
+    def test_file_read_line_range_with_huge_lines(self, tmp_path):
+        """Test that huge lines are skipped and capped without losing line numbers."""
+        filepath = tmp_path / "minified.js"
+        filepath.write_text("a" * 200000 + "\nline2\n" + "b" * 200000 + "\nline4\n")
+        read_tool = FileReadTool()
+
+        assert read_tool._run(str(filepath), start_line=2, end_line=2) == "line2\n"
+        assert read_tool._run(str(filepath), start_line=4) == "line4\n"
+
+        result = read_tool._run(str(filepath), start_line=3)
+        assert result == "b" * 50000 + "\n... (truncated)"
+
+    def test_file_search_anchored_pattern(self, tmp_path):
+        """Test that line anchors match per line, like ripgrep."""
+        tmpdir = str(tmp_path)
+        FileWriteTool()._run(f"{tmpdir}/mod.py", "x = 1\nimport os\nimport re\n")
+        FileWriteTool()._run(f"{tmpdir}/notes.txt", "import nothing\n")
+
+        result = FileSearchTool()._run(tmpdir, r"^import \w*$", file_pattern="*.py")
+
+        assert f"{tmpdir}/mod.py:2:import os" in result
+        assert f"{tmpdir}/mod.py:3:import re" in result
+        assert "notes.txt" not in result
+
+    def test_directory_tree(self, tmp_path):
         """Test directory tree generation."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            # Create some structure
-            Path(f"{tmpdir}/src").mkdir()
-            Path(f"{tmpdir}/src/main.py").touch()
-            Path(f"{tmpdir}/tests").mkdir()
-            Path(f"{tmpdir}/tests/test_main.py").touch()
-
-            tool = DirectoryTreeTool()
-            result = tool._run(tmpdir, max_depth=2)
-
-            assert "src" in result
-            assert "tests" in result
-            assert "main.py" in result
+        tmpdir = str(tmp_path)
+        # Create some structure
+        os.mkdir(f"{tmpdir}/src")
+        os.mkdir(f"{tmpdir}/tests")
+        for filepath in (f"{tmpdir}/src/main.py", f"{tmpdir}/tests/test_main.py"):
+            os.close(os.open(filepath, os.O_CREAT | os.O_WRONLY, 0o644))
+
+        tool = DirectoryTreeTool()
+        result = tool._run(tmpdir, max_depth=2)
+
+        assert "src" in result
+        assert "tests" in result
+        assert "main.py" in result
+
+    def test_directory_tree_marks_linked_directory(self, tmp_path):
+        """Test that a symlinked directory is shown as one but not expanded."""
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "main.py").touch()
+        (tmp_path / "src" / "loop").symlink_to(tmp_path)
+        (tmp_path / "zlink").symlink_to("src")
+        (tmp_path / "a.txt").touch()
+
+        result = DirectoryTreeTool()._run(str(tmp_path), max_depth=3)
+
+        assert f"loop -> {tmp_path}/" in result
+        assert "zlink -> src/" in result
+        assert result.count("main.py") == 1
+        # Linked directories sort with the directories, before files
+        assert result.index("zlink") < result.index("a.txt")
+
+
+class TestGitTools:
+    """Tests for git tools."""
+
+    async def test_git_tools_run_concurrently_async(self, tmp_path):
+        """Test that git tools can be awaited together."""
+        tmpdir = str(tmp_path)
+        subprocess.run(["git", "init", "-q", tmpdir], check=True)
+        Path(f"{tmpdir}/new.txt").touch()
+
+        status, log = await asyncio.gather(
+            GitStatusTool().arun(repo_path=tmpdir),
+            GitLogTool().arun(repo_path=tmpdir),
+        )
+
+        assert "new.txt" in status
+        assert "Git error" in log  # No commits yet
+
+    def test_git_status_sees_file_written_after_cached_status(self, tmp_path):
+        """Test that writing a file invalidates the cached git status."""
+        tmpdir = str(tmp_path)
+        subprocess.run(["git", "init", "-q", tmpdir], check=True)
+        status_tool = GitStatusTool()
+        assert "new.txt" not in status_tool._run(tmpdir)
+
+        FileWriteTool()._run(f"{tmpdir}/new.txt", "content")
+
+        assert "new.txt" in status_tool._run(tmpdir)
+
+    def test_git_status_leaves_repo_config_alone(self, tmp_path):
+        """Test that the read-only status tool doesn't write git config by default."""
+        tmpdir = str(tmp_path)
+        subprocess.run(["git", "init", "-q", tmpdir], check=True)
+
+        GitStatusTool()._run(tmpdir)
+
+        config = subprocess.run(
+            ["git", "config", "--local", "--get", "core.untrackedCache"],
+            cwd=tmpdir,
+            capture_output=True,
+        )
+        assert config.returncode == 1  # Key unset
+
+    def test_git_tools_report_deleted_repo(self, tmp_path):
+        """Test that a repo deleted after an earlier call gets an error, not a crash."""
+        repo = tmp_path / "repo"
+        subprocess.run(["git", "init", "-q", str(repo)], check=True)
+        assert "Error" not in GitStatusTool()._run(str(repo))
+
+        shutil.rmtree(repo)
+
+        assert "does not exist" in GitStatusTool()._run(str(repo))
+        assert "does not exist" in GitLogTool()._run(str(repo))
+
+    def test_git_tool_reports_repo_deleted_after_check(self, tmp_path, monkeypatch):
+        """Test that a repo removed between the check and the git call gets an error."""
+        repo = tmp_path / "repo"
+        subprocess.run(["git", "init", "-q", str(repo)], check=True)
+        check_repo = git_tools._check_repo
+
+        def check_then_delete(repo_path):
+            error = check_repo(repo_path)
+            shutil.rmtree(repo, ignore_errors=True)
+            return error
+
+        monkeypatch.setattr(git_tools, "_check_repo", check_then_delete)
+
+        assert "does not exist" in GitLogTool()._run(str(repo))
+
+    async def test_worktree_create_many_keeps_order_with_failures(self, tmp_path):
+        """Test that each worktree gets its own result, in spec order, when some fail."""
+        repo = tmp_path / "repo"
+        subprocess.run(["git", "init", "-q", "-b", "main", str(repo)], check=True)
+        identity = ["-c", "user.name=Sheep", "-c", "user.email=sheep@example.com"]
+        subprocess.run(
+            ["git", *identity, "commit", "-q", "--allow-empty", "-m", "init"],
+            cwd=repo,
+            check=True,
+        )
+        (tmp_path / "taken").mkdir()
+        specs = [
+            {"worktree_path": str(tmp_path / f"wt{i}"), "branch_name": f"feature-{i}"}
+            for i in range(6)
+        ]
+        specs[1]["worktree_path"] = str(tmp_path / "taken")
+        specs[3]["base_branch"] = "missing"
+
+        results = await GitWorktreeTool().create_many(str(repo), specs)
+
+        assert len(results) == 6
+        for i in (0, 2, 4, 5):
+            assert results[i] == f"Created worktree at {tmp_path}/wt{i} with branch feature-{i}"
+            assert (tmp_path / f"wt{i}" / ".git").exists()
+        assert results[1] == f"Error: Worktree path already exists: {tmp_path}/taken"
+        assert results[3].startswith("Git error:")
+        assert not (tmp_path / "wt3").exists()
+
+    async def test_worktree_create_many_without_repo(self, tmp_path):
+        """Test that a missing repo yields one error per spec."""
+        specs = [{"worktree_path": str(tmp_path / "wt"), "branch_name": "b"}] * 2
+
+        results = await GitWorktreeTool().create_many(str(tmp_path / "missing"), specs)
+
+        assert results == [f"Error: Repository path does not exist: {tmp_path}/missing"] * 2
+
+    def test_git_log_as_json(self, tmp_path):
+        """Test structured git log output."""
+        tmpdir = str(tmp_path)
+        subprocess.run(["git", "init", "-q", tmpdir], check=True)
+        identity = ["-c", "user.name=Sheep", "-c", "user.email=sheep@example.com"]
+        subprocess.run(
+            ["git", *identity, "commit", "-q", "--allow-empty", "-m", "First commit"],
+            cwd=tmpdir,
+            check=True,
+        )
+
+        commits = json.loads(GitLogTool()._run(tmpdir, as_json=True))
+
+        assert len(commits) == 1
+        assert commits[0]["subject"] == "First commit"
+        assert commits[0]["author"] == "Sheep"
+        assert len(commits[0]["sha"]) == 40
+
+
+class TestWebTools:
+    """Tests for web tools."""
+
+    def test_fetch_cache_round_trip_and_prune(self, tmp_path, monkeypatch):
+        """Test that cached pages load back intact and old entries are pruned."""
+        monkeypatch.setattr(web_tools, "_CACHE_DIR", tmp_path)
+        monkeypatch.setattr(web_tools, "_CACHE_MAX_ENTRIES", 2)
+        response = httpx.Response(200, headers={"etag": '"v1"'})
+
+        now = time.time()
+        for i in range(3):
+            url = f"https://example.com/{i}"
+            web_tools._store_cached(url, response, b"a\nb", "utf-8")
+            os.utime(web_tools._cache_path(url), (now - 10 + i, now - 10 + i))
+
+        assert len(list(tmp_path.iterdir())) == 2
+        assert web_tools._load_cached("https://example.com/0") is None
+        meta, body = web_tools._load_cached("https://example.com/2")
+        assert meta["etag"] == '"v1"'
+        assert body == b"a\nb"
+
+    @pytest.mark.parametrize(
+        "headers",
+        [
+            {},
+            {"etag": '"v1"', "cache-control": "no-store"},
+            {"last-modified": "Mon, 12 Oct 2026 00:00:00 GMT", "cache-control": "Private"},
+            {"etag": '"v1"', "cache-control": "max-age=60, private=\"set-cookie\""},
+        ],
+        ids=["no-validator", "no-store", "private", "private-field"],
+    )
+    def test_fetch_cache_skips_unstorable_responses(self, tmp_path, monkeypatch, headers):
+        """Test that responses without a validator or marked no-store/private aren't cached."""
+        monkeypatch.setattr(web_tools, "_CACHE_DIR", tmp_path)
+        url = "https://example.com/page"
+
+        web_tools._store_cached(url, httpx.Response(200, headers=headers), b"body", "utf-8")
+
+        assert web_tools._load_cached(url) is None
+        assert list(tmp_path.iterdir()) == []
+
+    async def test_search_many_keeps_order_with_failures(self, monkeypatch):
+        """Test that each query gets its own result, in order, when some fail."""
+
+        class FakeDDGS:
+            def text(self, query, max_results):
+                # Later queries finish first, so results can't just arrive in order
+                time.sleep(0.05 / int(query[-1]))
+                if query == "query 2":
+                    raise RuntimeError("backend down")
+                return [{"title": query, "href": "https://example.com", "body": "..."}]
+
+        monkeypatch.setattr(web_tools, "DDGS", FakeDDGS)
+        monkeypatch.setattr(web_tools, "_ddgs", FakeDDGS)
+        queries = [f"query {i}" for i in range(1, 7)]
+
+        results = await WebSearchTool().search_many(queries)
+
+        assert len(results) == 6
+        for query, result in zip(queries, results, strict=True):
+            if query == "query 2":
+                assert result.startswith("Error performing web search: backend down")
+            else:
+                assert result.startswith(f"Search results for '{query}':")
+                assert f"**{query}**" in result